@@ -1,13 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
 from inat_diff.client import iNatClient
 from inat_diff.utils import parse_time_period
 
 def main():
     client = iNatClient()
 
-    # Check what "Montana" resolves to
-    print("=== Place Resolution Debug ===")
     try:
-        place_id, place_info = client.resolve_place_with_info("Montana")
+        # The lookups below don't depend on each other, so start them together
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            place_future = executor.submit(client.resolve_place_with_info, "Montana")
+            montana_future = executor.submit(client.get_place, 16)
+            taxon_future = executor.submit(client.resolve_taxon, "Canis lupus")
+
+            place_id, place_info = place_future.result()
+            montana_info = montana_future.result()
+            taxon_id = taxon_future.result()
+
+            start_date, end_date = parse_time_period("last 6 months")
+
+            # Both observation queries only need the results above
+            obs_filters = dict(taxon_id=42048, d1=start_date, d2=end_date, per_page=5)
+            correct_future = executor.submit(client.get_observations, place_id=16, **obs_filters)
+            resolved_future = executor.submit(client.get_observations, place_id=place_id, **obs_filters)
+
+        # Check what "Montana" resolves to
+        print("=== Place Resolution Debug ===")
         print(f"'Montana' resolved to:")
         print(f"  Place ID: {place_id}")
         print(f"  Name: {place_info['name']}")
@@ -18,7 +35,6 @@ def main():
 
         # Show what place ID 16 is
         print("=== Expected Montana (place_id=16) ===")
-        montana_info = client.get_place(16)
         print(f"Place ID 16:")
         print(f"  Name: {montana_info.get('name')}")
         print(f"  Display Name: {montana_info.get('display_name')}")
@@ -27,37 +43,23 @@ def main():
 
         # Check taxon resolution
         print("=== Taxon Resolution Debug ===")
-        taxon_id = client.resolve_taxon("Canis lupus")
         print(f"'Canis lupus' resolved to taxon ID: {taxon_id}")
         print(f"Expected taxon ID: 42048")
         print()
 
         # Check time period parsing
         print("=== Time Period Debug ===")
-        start_date, end_date = parse_time_period("last 6 months")
         print(f"'last 6 months' parsed to: {start_date} to {end_date}")
         print()
 
         # Now let's test with the correct place ID
         print("=== Testing with place_id=16 directly ===")
-        obs_correct = client.get_observations(
-            place_id=16,
-            taxon_id=42048,
-            d1=start_date,
-            d2=end_date,
-            per_page=5
-        )
+        obs_correct = correct_future.result()
         print(f"Observations with place_id=16: {obs_correct.get('total_results', 0)}")
 
         # Test with resolved place ID
         print(f"=== Testing with resolved place_id={place_id} ===")
-        obs_resolved = client.get_observations(
-            place_id=place_id,
-            taxon_id=42048,
-            d1=start_date,
-            d2=end_date,
-            per_page=5
-        )
+        obs_resolved = resolved_future.result()
         print(f"Observations with place_id={place_id}: {obs_resolved.get('total_results', 0)}")
 
     except Exception as e:
@@ -5,6 +5,8 @@ This demonstrates the core use case of detecting species that appear
 to be new to a region.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 from inat_diff import SpeciesQuery
 
 def main():
@@ -23,17 +25,26 @@ def main():
     print("=" * 60)
     print("Checking for species observed this month with no prior history\n")
 
-    for latin_name, common_name in species_to_check:
-        print(f"\n{common_name} ({latin_name}):")
-        print("-" * 40)
-
-        try:
-            results = query.find_new_species_in_period(
+    # The checks are independent, so run them all at once (the client's rate
+    # limiter keeps the combined request rate in bounds) and report in order
+    with ThreadPoolExecutor(max_workers=len(species_to_check)) as executor:
+        futures = [
+            executor.submit(
+                query.find_new_species_in_period,
                 taxon_name=latin_name,
                 time_period="this month",
                 region="Oregon",
                 lookback_years=10
             )
+            for latin_name, _ in species_to_check
+        ]
+
+    for (latin_name, common_name), future in zip(species_to_check, futures):
+        print(f"\n{common_name} ({latin_name}):")
+        print("-" * 40)
+
+        try:
+            results = future.result()
 
             print(f"  Current observations: {results['total_results']}")
 
@@ -7,9 +7,16 @@ and biodiversity research through iNaturalist data.
 """
 
 import asyncio
+import atexit
 import json
 import logging
-from typing import Any, Optional
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Awaitable, Callable, Optional
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -17,233 +24,337 @@ from mcp.types import Tool, TextContent
 
 from inat_diff import SpeciesQuery
 from inat_diff.exceptions import iNatAPIError, PlaceNotFoundError, TaxonNotFoundError
+from inat_diff.utils import parse_time_period
 from inat_diff.visualize import (
     generate_new_species_html,
     generate_list_species_html,
     generate_query_html,
     annotate_species_with_quality,
+    use_client,
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging. Records go through a queue and are written to stderr by a
+# background thread, so logging never blocks the event loop.
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger("inat-mcp-server")
 
 # Initialize the server
 app = Server("inat-diff")
 
-# Initialize the query engine
+# Initialize the query engine. Quality-grade lookups use the same client, so
+# every tool call goes through one connection pool and one rate limiter.
 query_engine = SpeciesQuery()
+use_client(query_engine.client)
+
+# Blocking iNaturalist work runs on this pool rather than asyncio's unbounded
+# default executor. All API work shares query_engine's client, so a few
+# workers are enough and concurrent tool calls queue here instead of piling up
+# threads behind the limiter.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="inat-query")
+
+# Markdown for one species in the tool responses (one template per variant,
+# so each species is a single format call). {quality} is _QUALITY_SUFFIX or "".
+_NEW_SPECIES_LINE = (
+    "{i}. **{name}** ({common}) - {count} observations [{rank}]{quality}\n"
+    "   - View on iNaturalist: https://www.inaturalist.org/taxa/{taxon_id}"
+)
+_NEW_SPECIES_LINE_NO_COMMON = (
+    "{i}. **{name}** - {count} observations [{rank}]{quality}\n"
+    "   - View on iNaturalist: https://www.inaturalist.org/taxa/{taxon_id}"
+)
+_SPECIES_LINE = "{i}. **{name}** ({common}) - {count} obs. [{rank}]{quality}"
+_SPECIES_LINE_NO_COMMON = "{i}. **{name}** - {count} obs. [{rank}]{quality}"
+_QUALITY_SUFFIX = " - Quality: {}"
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools for iNaturalist data querying."""
-    return [
-        Tool(
-            name="find_new_species_in_region",
-            description=(
-                "Find all species that appear to be new to a region during a time period. "
-                "This is the main tool for invasive species monitoring - it identifies species "
-                "observed recently that have no prior observations in the lookback period. "
-                "Perfect for questions like: 'What new species appeared in Oregon this month?'"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "region": {
-                        "type": "string",
-                        "description": (
-                            "Geographic region name (e.g., 'Oregon', 'California', 'Kenya', "
-                            "'Multnomah County'). Can be a country, state, county, or other place "
-                            "recognized by iNaturalist."
-                        ),
-                    },
-                    "time_period": {
-                        "type": "string",
-                        "description": (
-                            "Time period to check for new observations. Examples: 'last 30 days', "
-                            "'this month', 'last month', 'this year', 'last year', 'last week', 'past 6 months', "
-                            "'2024-01-01 to 2024-12-31'"
-                        ),
-                    },
-                    "lookback_years": {
-                        "type": "integer",
-                        "description": (
-                            "Number of years to look back for historical data. Species with no "
-                            "observations in this lookback period are considered 'new'. "
-                            "Default: 20 years (recommended). Minimum: 1, Maximum: 50"
-                        ),
-                        "default": 20,
-                        "minimum": 1,
-                        "maximum": 50,
-                    },
-                    "rate_limit": {
-                        "type": "number",
-                        "description": (
-                            "Seconds to wait between API calls to iNaturalist. "
-                            "Default: 1.2 (50 requests/min). Range: 0.6-2.0. "
-                            "Lower = faster but may hit rate limits."
-                        ),
-                        "default": 1.2,
-                        "minimum": 0.6,
-                        "maximum": 2.0,
-                    },
-                    "output_format": {
-                        "type": "string",
-                        "description": (
-                            "Output format for the results. 'markdown' returns formatted text, "
-                            "'html' returns a styled HTML report. Default: 'markdown'."
-                        ),
-                        "enum": ["markdown", "html"],
-                        "default": "markdown",
-                    },
-                },
-                "required": ["region", "time_period"],
+async def _run_blocking(func, /, *args, **kwargs):
+    """Run a blocking query on the shared executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+# Species listings are reused for a while: a conversation often asks about the
+# same region and period in back-to-back tool calls
+RESULTS_CACHE_TTL = 15 * 60
+_results_cache: dict[tuple, tuple[float, dict]] = {}
+_results_cache_lock = threading.Lock()
+# Listings currently being fetched, so identical concurrent calls share one crawl
+_inflight: dict[tuple, asyncio.Future] = {}
+
+
+def _query_key(method: Callable[..., dict], time_period: str, region: str, kwargs: dict) -> tuple:
+    """Key identifying a listing query.
+
+    Relative periods like "this month" are also keyed by the dates they resolve
+    to, so cached results roll over with the calendar.
+    """
+    start_date, end_date = parse_time_period(time_period)
+    return (
+        method.__name__, region.strip().lower(), time_period.strip().lower(),
+        start_date, end_date, tuple(sorted(kwargs.items())),
+    )
+
+
+def _cached_query(key: tuple, method: Callable[..., dict], time_period: str, region: str, **kwargs) -> dict:
+    """Call a SpeciesQuery listing method, reusing a recent result for the same key.
+
+    Blocking; use _shared_query. The returned dict is shared and must not be modified.
+    """
+    now = time.monotonic()
+    with _results_cache_lock:
+        entry = _results_cache.get(key)
+    if entry is None or now - entry[0] >= RESULTS_CACHE_TTL:
+        entry = (now, method(time_period=time_period, region=region, **kwargs))
+        with _results_cache_lock:
+            for stale in [k for k, (stamp, _) in _results_cache.items() if now - stamp >= RESULTS_CACHE_TTL]:
+                del _results_cache[stale]
+            _results_cache[key] = entry
+    return entry[1]
+
+
+async def _shared_query(method: Callable[..., dict], time_period: str, region: str, **kwargs) -> dict:
+    """Run a SpeciesQuery listing method off the event loop, cached and coalesced.
+
+    Identical calls made while one is in flight wait for the same result instead
+    of starting another crawl. Each caller gets its own copies of the species
+    dicts, since quality annotation edits them in place.
+    """
+    key = _query_key(method, time_period, region, kwargs)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _run_blocking(_cached_query, key, method, time_period=time_period, region=region, **kwargs)
+        )
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shielded so one caller being cancelled doesn't cancel the crawl for the others
+    results = await asyncio.shield(task)
+    return {
+        field: [dict(item) for item in value] if isinstance(value, list) else value
+        for field, value in results.items()
+    }
+
+
+async def _report_progress(progress: float, total: float) -> None:
+    """Send a progress notification for the current tool call, if the client asked for them.
+
+    Tool results are returned in one piece, so long-running tools report their
+    completed steps this way while the rest of the work runs.
+    """
+    try:
+        ctx = app.request_context
+    except LookupError:  # Not inside a request
+        return
+    token = ctx.meta.progressToken if ctx.meta else None
+    if token is not None:
+        await ctx.session.send_progress_notification(token, progress, total)
+
+
+# Schema for the output_format argument shared by the report-producing tools
+_OUTPUT_FORMAT_PROP = {
+    "type": "string",
+    "description": (
+        "Output format for the results. 'markdown' returns formatted text, "
+        "'html' returns a styled HTML report. Default: 'markdown'."
+    ),
+    "enum": ["markdown", "html"],
+    "default": "markdown",
+}
+
+
+# Schema for the include_quality argument of the species-listing tools
+_INCLUDE_QUALITY_PROP = {
+    "type": "boolean",
+    "description": (
+        "Look up each species' best observation quality grade (Research Grade, Needs ID, "
+        "Casual). Takes a few extra API calls; set to false when only species and counts "
+        "are needed. Default: true."
+    ),
+    "default": True,
+}
+
+
+def _schema(required: list[str], **properties: dict) -> dict:
+    """Build a tool's JSON inputSchema from its properties."""
+    return {"type": "object", "properties": properties, "required": required}
+
+
+# Tool definitions are static, so build them once rather than on every tools/list request
+_TOOLS = [
+    Tool(
+        name="find_new_species_in_region",
+        description=(
+            "Find all species that appear to be new to a region during a time period. "
+            "This is the main tool for invasive species monitoring - it identifies species "
+            "observed recently that have no prior observations in the lookback period. "
+            "Perfect for questions like: 'What new species appeared in Oregon this month?'"
+        ),
+        inputSchema=_schema(
+            ["region", "time_period"],
+            region={
+                "type": "string",
+                "description": (
+                    "Geographic region name (e.g., 'Oregon', 'California', 'Kenya', "
+                    "'Multnomah County'). Can be a country, state, county, or other place "
+                    "recognized by iNaturalist."
+                ),
+            },
+            time_period={
+                "type": "string",
+                "description": (
+                    "Time period to check for new observations. Examples: 'last 30 days', "
+                    "'this month', 'last month', 'this year', 'last year', 'last week', 'past 6 months', "
+                    "'2024-01-01 to 2024-12-31'"
+                ),
+            },
+            lookback_years={
+                "type": "integer",
+                "description": (
+                    "Number of years to look back for historical data. Species with no "
+                    "observations in this lookback period are considered 'new'. "
+                    "Default: 20 years (recommended). Minimum: 1, Maximum: 50"
+                ),
+                "default": 20,
+                "minimum": 1,
+                "maximum": 50,
             },
+            rate_limit={
+                "type": "number",
+                "description": (
+                    "Deprecated and ignored: all tool calls share the server's rate "
+                    "limit (1.2 seconds per API call on average)."
+                ),
+                "minimum": 0.6,
+                "maximum": 2.0,
+                "deprecated": True,
+            },
+            output_format=_OUTPUT_FORMAT_PROP,
+            include_quality=_INCLUDE_QUALITY_PROP,
+        ),
+    ),
+    Tool(
+        name="check_if_species_is_new",
+        description=(
+            "Check if a specific species is new to a region. Returns whether the species "
+            "was observed during the time period and if it has any prior historical observations. "
+            "Use this when you want to check a specific species rather than finding all new species."
         ),
-        Tool(
-            name="check_if_species_is_new",
-            description=(
-                "Check if a specific species is new to a region. Returns whether the species "
-                "was observed during the time period and if it has any prior historical observations. "
-                "Use this when you want to check a specific species rather than finding all new species."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "species_name": {
-                        "type": "string",
-                        "description": (
-                            "Latin (scientific) name of the species to check. "
-                            "Examples: 'Python bivittatus' (Burmese Python), "
-                            "'Canis lupus' (Gray Wolf), 'Panthera leo' (Lion)"
-                        ),
-                    },
-                    "region": {
-                        "type": "string",
-                        "description": (
-                            "Geographic region name (e.g., 'Florida', 'Oregon', 'Kenya'). "
-                            "Can be a country, state, county, or other place recognized by iNaturalist."
-                        ),
-                    },
-                    "time_period": {
-                        "type": "string",
-                        "description": (
-                            "Time period to check for observations. Examples: 'this year', 'last year', "
-                            "'last 6 months', 'this month', 'last month', '2024-01-01 to 2024-12-31'"
-                        ),
-                    },
-                    "lookback_years": {
-                        "type": "integer",
-                        "description": (
-                            "Number of years to look back for historical data. Default: 20 years."
-                        ),
-                        "default": 20,
-                        "minimum": 1,
-                        "maximum": 50,
-                    },
-                    "output_format": {
-                        "type": "string",
-                        "description": (
-                            "Output format for the results. 'markdown' returns formatted text, "
-                            "'html' returns a styled HTML report. Default: 'markdown'."
-                        ),
-                        "enum": ["markdown", "html"],
-                        "default": "markdown",
-                    },
-                },
-                "required": ["species_name", "region", "time_period"],
+        inputSchema=_schema(
+            ["species_name", "region", "time_period"],
+            species_name={
+                "type": "string",
+                "description": (
+                    "Latin (scientific) name of the species to check. "
+                    "Examples: 'Python bivittatus' (Burmese Python), "
+                    "'Canis lupus' (Gray Wolf), 'Panthera leo' (Lion)"
+                ),
+            },
+            region={
+                "type": "string",
+                "description": (
+                    "Geographic region name (e.g., 'Florida', 'Oregon', 'Kenya'). "
+                    "Can be a country, state, county, or other place recognized by iNaturalist."
+                ),
             },
+            time_period={
+                "type": "string",
+                "description": (
+                    "Time period to check for observations. Examples: 'this year', 'last year', "
+                    "'last 6 months', 'this month', 'last month', '2024-01-01 to 2024-12-31'"
+                ),
+            },
+            lookback_years={
+                "type": "integer",
+                "description": (
+                    "Number of years to look back for historical data. Default: 20 years."
+                ),
+                "default": 20,
+                "minimum": 1,
+                "maximum": 50,
+            },
+            output_format=_OUTPUT_FORMAT_PROP,
+        ),
+    ),
+    Tool(
+        name="list_species_in_region",
+        description=(
+            "List all species observed in a region during a specific time period. "
+            "Returns species counts and names. Useful for getting an overview of biodiversity "
+            "in a region without filtering for 'new' species."
         ),
-        Tool(
-            name="list_species_in_region",
-            description=(
-                "List all species observed in a region during a specific time period. "
-                "Returns species counts and names. Useful for getting an overview of biodiversity "
-                "in a region without filtering for 'new' species."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "region": {
-                        "type": "string",
-                        "description": (
-                            "Geographic region name (e.g., 'Oregon', 'California', 'Kenya')."
-                        ),
-                    },
-                    "time_period": {
-                        "type": "string",
-                        "description": (
-                            "Time period to query. Examples: 'last month', 'this month', 'this year', 'last year', "
-                            "'last 30 days', '2024-01-01 to 2024-06-30'"
-                        ),
-                    },
-                    "output_format": {
-                        "type": "string",
-                        "description": (
-                            "Output format for the results. 'markdown' returns formatted text, "
-                            "'html' returns a styled HTML report. Default: 'markdown'."
-                        ),
-                        "enum": ["markdown", "html"],
-                        "default": "markdown",
-                    },
-                },
-                "required": ["region", "time_period"],
+        inputSchema=_schema(
+            ["region", "time_period"],
+            region={
+                "type": "string",
+                "description": (
+                    "Geographic region name (e.g., 'Oregon', 'California', 'Kenya')."
+                ),
             },
+            time_period={
+                "type": "string",
+                "description": (
+                    "Time period to query. Examples: 'last month', 'this month', 'this year', 'last year', "
+                    "'last 30 days', '2024-01-01 to 2024-06-30'"
+                ),
+            },
+            output_format=_OUTPUT_FORMAT_PROP,
+            include_quality=_INCLUDE_QUALITY_PROP,
+        ),
+    ),
+    Tool(
+        name="query_species_observations",
+        description=(
+            "Query detailed observations for a specific species in a region and time period. "
+            "Returns individual observation records (up to 200 per page). "
+            "Use this when you need detailed observation data rather than just counts."
         ),
-        Tool(
-            name="query_species_observations",
-            description=(
-                "Query detailed observations for a specific species in a region and time period. "
-                "Returns individual observation records (up to 200 per page). "
-                "Use this when you need detailed observation data rather than just counts."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "species_name": {
-                        "type": "string",
-                        "description": (
-                            "Latin (scientific) name of the species. "
-                            "Examples: 'Canis lupus', 'Panthera leo'"
-                        ),
-                    },
-                    "region": {
-                        "type": "string",
-                        "description": "Geographic region name.",
-                    },
-                    "time_period": {
-                        "type": "string",
-                        "description": (
-                            "Time period to query. Examples: 'last 30 days', 'this month', 'last month', 'this year'"
-                        ),
-                    },
-                },
-                "required": ["species_name", "region", "time_period"],
+        inputSchema=_schema(
+            ["species_name", "region", "time_period"],
+            species_name={
+                "type": "string",
+                "description": (
+                    "Latin (scientific) name of the species. "
+                    "Examples: 'Canis lupus', 'Panthera leo'"
+                ),
+            },
+            region={
+                "type": "string",
+                "description": "Geographic region name.",
+            },
+            time_period={
+                "type": "string",
+                "description": (
+                    "Time period to query. Examples: 'last 30 days', 'this month', 'last month', 'this year'"
+                ),
             },
         ),
-    ]
+    ),
+]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools for iNaturalist data querying."""
+    return _TOOLS
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls for iNaturalist queries."""
     try:
-        if name == "find_new_species_in_region":
-            return await find_new_species_in_region(arguments)
-        elif name == "check_if_species_is_new":
-            return await check_if_species_is_new(arguments)
-        elif name == "list_species_in_region":
-            return await list_species_in_region(arguments)
-        elif name == "query_species_observations":
-            return await query_species_observations(arguments)
-        else:
+        handler = _HANDLERS.get(name)
+        if handler is None:
             return [
                 TextContent(
                     type="text",
                     text=f"Unknown tool: {name}",
                 )
             ]
+        return await handler(arguments)
     except PlaceNotFoundError as e:
         return [
             TextContent(
@@ -266,7 +377,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             )
         ]
     except Exception as e:
-        logger.exception(f"Error processing tool call {name}")
+        logger.exception("Error processing tool call %s", name)
         return [
             TextContent(
                 type="text",
@@ -280,30 +391,32 @@ async def find_new_species_in_region(arguments: dict) -> list[TextContent]:
     region = arguments["region"]
     time_period = arguments["time_period"]
     lookback_years = arguments.get("lookback_years", 20)
-    rate_limit = arguments.get("rate_limit", 1.2)
     output_format = arguments.get("output_format", "markdown")
+    include_quality = arguments.get("include_quality", True)
+    if "rate_limit" in arguments:
+        logger.warning("Ignoring deprecated rate_limit argument; all tool calls share one rate limit")
 
     logger.info(
-        f"Finding new species in {region} during {time_period} "
-        f"(lookback: {lookback_years} years, rate limit: {rate_limit}s, format: {output_format})"
+        "Finding new species in %s during %s (lookback: %s years, format: %s)",
+        region, time_period, lookback_years, output_format,
     )
 
     # Run the query in a thread pool to avoid blocking
-    loop = asyncio.get_event_loop()
-    results = await loop.run_in_executor(
-        None,
-        lambda: query_engine.find_all_new_species_in_period(
-            time_period=time_period,
-            region=region,
-            lookback_years=lookback_years,
-            rate_limit=rate_limit,
-            verbose=True,
-        ),
+    results = await _shared_query(
+        query_engine.find_all_new_species_in_period,
+        time_period=time_period,
+        region=region,
+        lookback_years=lookback_years,
+        verbose=True,
     )
+    # Species are known; quality grades and formatting remain
+    await _report_progress(1, 2)
 
-    # Generate HTML if requested
+    # Generate HTML if requested (quality lookups hit the API, so keep them off the event loop)
     if output_format == "html":
-        html_output = generate_new_species_html(results, include_quality=True, rate_limit=rate_limit)
+        html_output = await _run_blocking(
+            generate_new_species_html, results, include_quality=include_quality
+        )
         return [
             TextContent(
                 type="text",
@@ -335,30 +448,25 @@ async def find_new_species_in_region(arguments: dict) -> list[TextContent]:
 
         new_species = results["new_species"]
 
-        # Annotate species with quality grades
-        place_id = results["query"].get("place_id")
-        annotate_species_with_quality(new_species, place_id, rate_limit=rate_limit)
+        # Annotate species with quality grades (batched, concurrent API calls)
+        if include_quality:
+            place_id = results["query"].get("place_id")
+            await _run_blocking(annotate_species_with_quality, new_species, place_id)
 
         # Show first 50 new species
         for i, species in enumerate(new_species[:50], 1):
-            name = species.get("name", "Unknown")
-            common = species.get("preferred_common_name")
-            count = species.get("observation_count", 0)
-            rank = species.get("rank", "")
-            taxon_id = species.get("id")
-            quality = species.get("highest_quality_grade_label", "Unknown")
-
-            inat_url = f"https://www.inaturalist.org/taxa/{taxon_id}"
-
-            if common:
-                response_lines.append(
-                    f"{i}. **{name}** ({common}) - {count} observations [{rank}] - Quality: {quality}"
-                )
-            else:
-                response_lines.append(
-                    f"{i}. **{name}** - {count} observations [{rank}] - Quality: {quality}"
-                )
-            response_lines.append(f"   - View on iNaturalist: {inat_url}")
+            get = species.get
+            common = get("preferred_common_name")
+            template = _NEW_SPECIES_LINE if common else _NEW_SPECIES_LINE_NO_COMMON
+            response_lines.append(template.format(
+                i=i,
+                name=get("name", "Unknown"),
+                common=common,
+                count=get("observation_count", 0),
+                rank=get("rank", ""),
+                quality=_QUALITY_SUFFIX.format(get("highest_quality_grade_label", "Unknown")) if include_quality else "",
+                taxon_id=get("id"),
+            ))
 
         if len(new_species) > 50:
             response_lines.append(f"")
@@ -390,20 +498,17 @@ async def check_if_species_is_new(arguments: dict) -> list[TextContent]:
     output_format = arguments.get("output_format", "markdown")
 
     logger.info(
-        f"Checking if {species_name} is new to {region} in {time_period} "
-        f"(lookback: {lookback_years} years, format: {output_format})"
+        "Checking if %s is new to %s in %s (lookback: %s years, format: %s)",
+        species_name, region, time_period, lookback_years, output_format,
     )
 
     # Run the query in a thread pool
-    loop = asyncio.get_event_loop()
-    results = await loop.run_in_executor(
-        None,
-        lambda: query_engine.find_new_species_in_period(
-            taxon_name=species_name,
-            time_period=time_period,
-            region=region,
-            lookback_years=lookback_years,
-        ),
+    results = await _run_blocking(
+        query_engine.find_new_species_in_period,
+        taxon_name=species_name,
+        time_period=time_period,
+        region=region,
+        lookback_years=lookback_years,
     )
 
     # Generate HTML if requested
@@ -474,23 +579,25 @@ async def list_species_in_region(arguments: dict) -> list[TextContent]:
     region = arguments["region"]
     time_period = arguments["time_period"]
     output_format = arguments.get("output_format", "markdown")
+    include_quality = arguments.get("include_quality", True)
 
-    logger.info(f"Listing species in {region} during {time_period} (format: {output_format})")
+    logger.info("Listing species in %s during %s (format: %s)", region, time_period, output_format)
 
     # Run the query in a thread pool
-    loop = asyncio.get_event_loop()
-    results = await loop.run_in_executor(
-        None,
-        lambda: query_engine.get_all_species_in_period(
-            time_period=time_period,
-            region=region,
-            page_limit=None,  # Fetch all
-        ),
+    results = await _shared_query(
+        query_engine.get_all_species_in_period,
+        time_period=time_period,
+        region=region,
+        page_limit=None,  # Fetch all
     )
+    # Species are known; quality grades and formatting remain
+    await _report_progress(1, 2)
 
-    # Generate HTML if requested
+    # Generate HTML if requested (quality lookups hit the API, so keep them off the event loop)
     if output_format == "html":
-        html_output = generate_list_species_html(results, include_quality=True, rate_limit=1.2)
+        html_output = await _run_blocking(
+            generate_list_species_html, results, include_quality=include_quality
+        )
         return [
             TextContent(
                 type="text",
@@ -518,24 +625,24 @@ async def list_species_in_region(arguments: dict) -> list[TextContent]:
         response_lines.append(f"## Species List")
         response_lines.append("")
 
-        # Annotate species with quality grades
-        place_id = results["query"].get("place_id")
-        annotate_species_with_quality(species_list, place_id, rate_limit=1.2)
+        # Annotate species with quality grades (batched, concurrent API calls)
+        if include_quality:
+            place_id = results["query"].get("place_id")
+            await _run_blocking(annotate_species_with_quality, species_list, place_id)
 
         # Show first 100 species
         for i, species in enumerate(species_list[:100], 1):
-            name = species.get("name", "Unknown")
-            common = species.get("preferred_common_name")
-            count = species.get("observation_count", 0)
-            rank = species.get("rank", "")
-            quality = species.get("highest_quality_grade_label", "Unknown")
-
-            if common:
-                response_lines.append(
-                    f"{i}. **{name}** ({common}) - {count} obs. [{rank}] - Quality: {quality}"
-                )
-            else:
-                response_lines.append(f"{i}. **{name}** - {count} obs. [{rank}] - Quality: {quality}")
+            get = species.get
+            common = get("preferred_common_name")
+            template = _SPECIES_LINE if common else _SPECIES_LINE_NO_COMMON
+            response_lines.append(template.format(
+                i=i,
+                name=get("name", "Unknown"),
+                common=common,
+                count=get("observation_count", 0),
+                rank=get("rank", ""),
+                quality=_QUALITY_SUFFIX.format(get("highest_quality_grade_label", "Unknown")) if include_quality else "",
+            ))
 
         if species_count > 100:
             response_lines.append(f"")
@@ -557,19 +664,14 @@ async def query_species_observations(arguments: dict) -> list[TextContent]:
     region = arguments["region"]
     time_period = arguments["time_period"]
 
-    logger.info(
-        f"Querying observations for {species_name} in {region} during {time_period}"
-    )
+    logger.info("Querying observations for %s in %s during %s", species_name, region, time_period)
 
     # Run the query in a thread pool
-    loop = asyncio.get_event_loop()
-    results = await loop.run_in_executor(
-        None,
-        lambda: query_engine.query_species_in_period(
-            taxon_name=species_name,
-            time_period=time_period,
-            region=region,
-        ),
+    results = await _run_blocking(
+        query_engine.query_species_in_period,
+        taxon_name=species_name,
+        time_period=time_period,
+        region=region,
     )
 
     total = results["total_results"]
@@ -597,6 +699,15 @@ async def query_species_observations(arguments: dict) -> list[TextContent]:
     ]
 
 
+# Tool name -> handler, used by call_tool
+_HANDLERS: dict[str, Callable[[dict], Awaitable[list[TextContent]]]] = {
+    "find_new_species_in_region": find_new_species_in_region,
+    "check_if_species_is_new": check_if_species_is_new,
+    "list_species_in_region": list_species_in_region,
+    "query_species_observations": query_species_observations,
+}
+
+
 async def main():
     """Main entry point for the MCP server."""
     logger.info("Starting iNaturalist Difference Detection MCP Server")
@@ -5,9 +5,29 @@ A Python library for querying iNaturalist observations to detect species presenc
 patterns across regions and time periods.
 """
 
-from .client import iNatClient
-from .query import SpeciesQuery
-from .exceptions import iNatAPIError, PlaceNotFoundError, TaxonNotFoundError
+from importlib import import_module
 
 __version__ = "0.1.0"
-__all__ = ["iNatClient", "SpeciesQuery", "iNatAPIError", "PlaceNotFoundError", "TaxonNotFoundError"]
\ No newline at end of file
+__all__ = ["iNatClient", "SpeciesQuery", "iNatAPIError", "PlaceNotFoundError", "TaxonNotFoundError"]
+
+# Public names are imported on first access so that importing the package (e.g.
+# for the CLI's --help) doesn't pull in requests and urllib3 up front.
+_LAZY_IMPORTS = {
+    "iNatClient": ".client",
+    "SpeciesQuery": ".query",
+    "iNatAPIError": ".exceptions",
+    "PlaceNotFoundError": ".exceptions",
+    "TaxonNotFoundError": ".exceptions",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,86 +1,110 @@
 """Command-line interface for iNaturalist difference detection."""
 
 import argparse
-import json
+import io
 import sys
-from typing import Dict, Any
-from .query import SpeciesQuery
+from typing import TYPE_CHECKING, Dict, Any
 from .exceptions import iNatAPIError
+from .utils import dumps_json
+
+if TYPE_CHECKING:
+    from .query import SpeciesQuery
 
 
 def save_json_output(results: Dict[str, Any], output_file: str):
     """Save results to a JSON file."""
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(dumps_json(results, indent=True))
+
+
+def create_query(args) -> "SpeciesQuery":
+    """Create the query engine, with a persistent response cache if requested."""
+    # Imported here so that --help and argument errors don't pay for importing requests
+    from .client import iNatClient
+    from .query import SpeciesQuery
+
+    cache_path = iNatClient.DEFAULT_CACHE_PATH if getattr(args, "cache", False) else None
+    try:
+        client = iNatClient(rate_limit=getattr(args, "rate_limit", 1.2), cache_path=cache_path)
+    except ImportError as e:  # --cache without the optional requests-cache dependency
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    return SpeciesQuery(client)
+
+
+# Per-species lines in format_results
+_NEW_SPECIES_LINE = "  {name} ({common}) [{rank}]: {count} observations\n"
+_NEW_SPECIES_LINE_NO_COMMON = "  {name} [{rank}]: {count} observations\n"
+_SPECIES_LINE = "  {name} ({common}): {count} observations\n"
+_SPECIES_LINE_NO_COMMON = "  {name}: {count} observations\n"
 
 
 def format_results(results: Dict[str, Any]) -> str:
     """Format query results for text display."""
     # Text formatting
-    output = []
+    buf = io.StringIO()
+    w = buf.write
     query = results.get("query", {})
 
     # Handle "find all new species" results
     if "new_species_count" in results:
         # Show place resolution info
         if query.get('place_display_name'):
-            output.append(f"Region searched: {query.get('region', 'Unknown')}")
-            output.append(f"Resolved to: {query.get('place_display_name', 'Unknown')} (ID: {query.get('place_id', 'Unknown')})")
+            w(f"Region searched: {query.get('region', 'Unknown')}\n")
+            w(f"Resolved to: {query.get('place_display_name', 'Unknown')} (ID: {query.get('place_id', 'Unknown')})\n")
             if query.get('place_matched_as') == 'fallback (first result)':
-                output.append(f"⚠️  WARNING: No exact match found - using first search result")
-            output.append("")
+                w("⚠️  WARNING: No exact match found - using first search result\n")
+            w("\n")
         else:
-            output.append(f"Region: {query.get('region', 'Unknown')}")
+            w(f"Region: {query.get('region', 'Unknown')}\n")
 
-        output.append(f"Period: {query.get('time_period', 'Unknown')} ({query.get('start_date')} to {query.get('end_date')})")
-        output.append(f"Lookback: {results.get('lookback_years', 0)} years ({results.get('lookback_period', 'Unknown')})")
-        output.append(f"\nTotal species in period: {results.get('total_species_in_period', 0)}")
-        output.append(f"New species (no prior observations): {results.get('new_species_count', 0)}")
-        output.append(f"Established species: {results.get('established_species_count', 0)}")
+        w(f"Period: {query.get('time_period', 'Unknown')} ({query.get('start_date')} to {query.get('end_date')})\n")
+        w(f"Lookback: {results.get('lookback_years', 0)} years ({results.get('lookback_period', 'Unknown')})\n")
+        w(f"\nTotal species in period: {results.get('total_species_in_period', 0)}\n")
+        w(f"New species (no prior observations): {results.get('new_species_count', 0)}\n")
+        w(f"Established species: {results.get('established_species_count', 0)}\n")
 
         new_species = results.get("new_species", [])
         if new_species:
-            output.append(f"\n=== NEW SPECIES ({len(new_species)}) ===")
+            w(f"\n=== NEW SPECIES ({len(new_species)}) ===\n")
             for species in new_species[:20]:  # Show first 20
-                name = species.get("name", "Unknown")
-                common = species.get("preferred_common_name", "")
-                count = species.get("observation_count", 0)
-                rank = species.get("rank", "")
-                if common:
-                    output.append(f"  {name} ({common}) [{rank}]: {count} observations")
-                else:
-                    output.append(f"  {name} [{rank}]: {count} observations")
+                get = species.get
+                name = get("name", "Unknown")
+                common = get("preferred_common_name", "")
+                count = get("observation_count", 0)
+                rank = get("rank", "")
+                template = _NEW_SPECIES_LINE if common else _NEW_SPECIES_LINE_NO_COMMON
+                w(template.format(name=name, common=common, rank=rank, count=count))
             if len(new_species) > 20:
-                output.append(f"  ... and {len(new_species) - 20} more")
-        return "\n".join(output)
+                w(f"  ... and {len(new_species) - 20} more\n")
+        return buf.getvalue().rstrip("\n")
 
     # Standard query output
-    output.append(f"Query: {query.get('taxon_name', 'Unknown')} in {query.get('region', 'Unknown')}")
-    output.append(f"Period: {query.get('time_period', 'Unknown')} ({query.get('start_date')} to {query.get('end_date')})")
-    output.append(f"Total observations: {results.get('total_results', 0)}")
+    w(f"Query: {query.get('taxon_name', 'Unknown')} in {query.get('region', 'Unknown')}\n")
+    w(f"Period: {query.get('time_period', 'Unknown')} ({query.get('start_date')} to {query.get('end_date')})\n")
+    w(f"Total observations: {results.get('total_results', 0)}\n")
 
     if "is_new_to_region" in results:
-        output.append(f"New to region: {'YES' if results['is_new_to_region'] else 'NO'}")
-        output.append(f"Analysis: {results.get('analysis', 'No analysis available')}")
+        w(f"New to region: {'YES' if results['is_new_to_region'] else 'NO'}\n")
+        w(f"Analysis: {results.get('analysis', 'No analysis available')}\n")
 
     if "species" in results:
-        output.append(f"\nUnique species found: {results.get('species_count', 0)}")
+        w(f"\nUnique species found: {results.get('species_count', 0)}\n")
         for species in results.get("species", [])[:10]:  # Show first 10
-            name = species.get("name", "Unknown")
-            common = species.get("preferred_common_name", "")
-            count = species.get("observation_count", 0)
-            if common:
-                output.append(f"  {name} ({common}): {count} observations")
-            else:
-                output.append(f"  {name}: {count} observations")
+            get = species.get
+            name = get("name", "Unknown")
+            common = get("preferred_common_name", "")
+            count = get("observation_count", 0)
+            template = _SPECIES_LINE if common else _SPECIES_LINE_NO_COMMON
+            w(template.format(name=name, common=common, count=count))
 
-    return "\n".join(output)
+    return buf.getvalue().rstrip("\n")
 
 
 def cmd_query(args):
     """Handle the query command."""
     try:
-        query = SpeciesQuery()
+        query = create_query(args)
         results = query.query_species_in_period(
             taxon_name=args.taxon,
             time_period=args.period,
@@ -102,7 +126,7 @@ def cmd_query(args):
 def cmd_new_species(args):
     """Handle the new-species command."""
     try:
-        query = SpeciesQuery()
+        query = create_query(args)
 
         # If taxon is provided, check that specific species
         if args.taxon:
@@ -118,7 +142,6 @@ def cmd_new_species(args):
                 time_period=args.period,
                 region=args.region,
                 lookback_years=args.lookback,
-                rate_limit=args.rate_limit,
                 verbose=True
             )
 
@@ -137,7 +160,7 @@ def cmd_new_species(args):
 def cmd_list_species(args):
     """Handle the list-species command."""
     try:
-        query = SpeciesQuery()
+        query = create_query(args)
         results = query.get_all_species_in_period(
             time_period=args.period,
             region=args.region,
@@ -178,6 +201,9 @@ Examples:
   # List all species in a region during time period
   inat-diff list-species "last month" "Oregon"
 
+  # Reuse cached API responses from earlier runs (pip install "inat-diff[cache]")
+  inat-diff --cache new-species "this month" "Oregon"
+
 Supported time periods:
   - "last N days/weeks/months/years"
   - "past N days/weeks/months/years"
@@ -194,6 +220,9 @@ Supported regions:
 
     parser.add_argument("--output-file", "-o", type=str,
                        help="Save results to JSON file (console output remains in text format)")
+    parser.add_argument("--cache", action="store_true",
+                       help="Cache API responses on disk (~/.cache/inat-diff) so repeated runs "
+                            "skip unchanged historical queries (requires requests-cache)")
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
@@ -214,7 +243,7 @@ Supported regions:
     new_parser.add_argument("--lookback-years", type=int, default=20, dest="lookback",
                            help="Years to look back for historical data (default: 20)")
     new_parser.add_argument("--rate-limit", type=float, default=1.2, dest="rate_limit",
-                           help="Seconds to wait between API calls (default: 1.2 = 50/min, iNat limit is 60-100/min)")
+                           help="Average seconds per API call (default: 1.2 = 50/min, iNat limit is 60-100/min)")
     new_parser.add_argument("--output-file", "-o", type=str,
                            help="Save results to JSON file")
     new_parser.set_defaults(func=cmd_new_species)
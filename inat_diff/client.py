@@ -1,33 +1,222 @@
 """Core API client for iNaturalist."""
 
+import math
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import islice
+from pathlib import Path
 import requests
-from typing import Dict, List, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Union
 from .exceptions import iNatAPIError, PlaceNotFoundError, TaxonNotFoundError
+from .lookups import KNOWN_PLACES, KNOWN_TAXA, PRIORITY_PLACE_TYPES
+from .ratelimit import RateLimiter
+from .utils import loads_json
 
 
 class iNatClient:
     """Client for interacting with the iNaturalist API."""
 
     BASE_URL = "https://api.inaturalist.org/v1"
-
-    def __init__(self, user_agent: str = "inat-diff/0.1.0"):
-        """Initialize the client with optional user agent."""
-        self.session = requests.Session()
+    DEFAULT_CACHE_PATH = Path.home() / ".cache" / "inat-diff" / "http_cache"
+    # Late uploads barely change the species seen over a multi-year window, so
+    # closed windows of a year or more are cached longer than other queries
+    LONG_WINDOW_EXPIRE_AFTER = 30 * 24 * 60 * 60
+    # All-time aggregates over a whole place change slowly, so undated
+    # observation queries are cached for a day
+    UNDATED_EXPIRE_AFTER = 24 * 60 * 60
+
+    def __init__(self,
+                 user_agent: str = "inat-diff/0.1.0",
+                 rate_limit: float = 1.2,  # 50 req/min, below iNaturalist's 60 req/min recommendation
+                 max_concurrent: int = 4,
+                 max_retries: int = 3,
+                 timeout: float = 30.0,
+                 cache_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the client.
+
+        Args:
+            user_agent: User-Agent header sent with every request
+            rate_limit: Average seconds per API call, shared by all threads using this client
+            max_concurrent: Maximum number of requests in flight at once
+            max_retries: How many times to retry a request rejected with HTTP 429
+            timeout: Seconds to wait for the server before a request is retried or fails
+            cache_path: If set, cache responses in this SQLite file across runs
+                (requires the optional requests-cache dependency)
+        """
+        self.session = self._create_session(cache_path)
+        self.cache_enabled = cache_path is not None
         self.session.headers.update({
             "User-Agent": user_agent,
-            "Accept": "application/json"
+            "Accept": "application/json",
+            # gzip/deflate, plus br/zstd when urllib3 has a decoder installed for them
+            "Accept-Encoding": ACCEPT_ENCODING
         })
 
+        # Keep enough warm keep-alive connections for every concurrent request and
+        # retry transient server errors at the transport level (honoring any
+        # Retry-After on 503). HTTP 429 is left to _make_request so that retries
+        # go back through the rate limiter.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max_concurrent,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+                allowed_methods=["GET"],
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+
+        self.max_concurrent = max_concurrent
+        self.rate_limiter = RateLimiter(max_concurrent=max_concurrent)
+        self.set_rate_limit(rate_limit)
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        # Resolution results are deterministic, so each name or ID only needs
+        # to be looked up once per client
+        self._place_cache: Dict[str, tuple[int, dict]] = {}
+        self._taxon_cache: Dict[str, int] = {}
+        self._place_info_cache: Dict[int, Dict[str, Any]] = {}
+
+    def clear_caches(self) -> None:
+        """Forget all memoized place and taxon lookups."""
+        self._place_cache.clear()
+        self._taxon_cache.clear()
+        self._place_info_cache.clear()
+
+    def _create_session(self, cache_path: Optional[Union[str, Path]]) -> requests.Session:
+        """Create a plain session, or a persistent cached session if cache_path is set."""
+        if cache_path is None:
+            return requests.Session()
+
+        try:
+            import requests_cache
+        except ImportError:
+            raise ImportError(
+                "Response caching requires requests-cache: pip install 'inat-diff[cache]'"
+            ) from None
+
+        Path(cache_path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+        host = self.BASE_URL.split("://")[-1]
+        day = 24 * 60 * 60
+        # Place records never change; name searches and observation queries are
+        # cached for a while. Queries whose date range reaches today bypass the
+        # cache entirely, long closed ranges are kept for a month and undated
+        # queries for a day (see _make_request).
+        return requests_cache.CachedSession(
+            cache_name=str(Path(cache_path).expanduser()),
+            backend="sqlite",
+            expire_after=requests_cache.DO_NOT_CACHE,
+            urls_expire_after={
+                f"{host}/places/autocomplete": day,
+                f"{host}/places/*": requests_cache.NEVER_EXPIRE,
+                f"{host}/taxa": day,
+                f"{host}/observations": 7 * day,
+            }
+        )
+
+    def set_rate_limit(self, rate_limit: float) -> None:
+        """Change the average number of seconds per API call (0 = unlimited)."""
+        self.rate_limit = rate_limit
+        self.rate_limiter.set_interval(rate_limit)
+
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
-        """Make a request to the iNaturalist API."""
+        """Make a rate-limited request to the iNaturalist API, backing off on HTTP 429."""
         url = f"{self.BASE_URL}/{endpoint}"
+        params = params or {}
+        request_kwargs = {}
+        if self.cache_enabled:
+            if self._is_undated(endpoint, params):
+                request_kwargs["expire_after"] = self.UNDATED_EXPIRE_AFTER
+            elif self._is_open_ended(endpoint, params):
+                import requests_cache
+                request_kwargs["expire_after"] = requests_cache.DO_NOT_CACHE
+            elif self._is_long_window(endpoint, params):
+                request_kwargs["expire_after"] = self.LONG_WINDOW_EXPIRE_AFTER
+
         try:
-            response = self.session.get(url, params=params or {})
+            for attempt in range(self.max_retries + 1):
+                stamp = self.rate_limiter.acquire()
+                try:
+                    response = self.session.get(
+                        url, params=params, timeout=self.timeout, **request_kwargs
+                    )
+                finally:
+                    self.rate_limiter.release()
+                # Responses served from the local cache don't count against the API limit
+                if getattr(response, "from_cache", False):
+                    self.rate_limiter.refund(stamp)
+
+                if response.status_code != 429 or attempt == self.max_retries:
+                    break
+                # Sleep outside the limiter so other threads can keep working
+                time.sleep(self._retry_delay(response, attempt))
+
             response.raise_for_status()
-            return response.json()
         except requests.RequestException as e:
             raise iNatAPIError(f"API request failed: {e}")
 
+        try:
+            return loads_json(response.content)
+        except ValueError as e:
+            raise iNatAPIError(f"Invalid API response: {e}")
+
+    @staticmethod
+    def _is_undated(endpoint: str, params: Dict) -> bool:
+        """Whether an observation query has no date range (e.g. a taxon's all-time quality grades)."""
+        return endpoint.startswith("observations") and not params.get("d1") and not params.get("d2")
+
+    @staticmethod
+    def _is_open_ended(endpoint: str, params: Dict) -> bool:
+        """Whether an observation query covers dates up to today, so its results can still change."""
+        if not endpoint.startswith("observations"):
+            return False
+        d2 = params.get("d2")
+        return not d2 or str(d2) >= date.today().isoformat()
+
+    @staticmethod
+    def _is_long_window(endpoint: str, params: Dict) -> bool:
+        """Whether an observation query covers a year or more (e.g. a historical lookback)."""
+        if not endpoint.startswith("observations"):
+            return False
+        try:
+            d1 = date.fromisoformat(str(params["d1"]))
+            d2 = date.fromisoformat(str(params["d2"]))
+        except (KeyError, ValueError):
+            return False
+        return (d2 - d1).days >= 365
+
+    @staticmethod
+    def _id_list(ids: Union[int, str, Iterable[int]]) -> Union[int, str]:
+        """Format one ID or several as the API's comma-separated ID list."""
+        if isinstance(ids, (int, str)):
+            return ids
+        return ",".join(str(i) for i in ids)
+
+    @staticmethod
+    def _retry_delay(response: requests.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a throttled request.
+
+        Uses the server's Retry-After when it gives a number of seconds,
+        otherwise exponential backoff with jitter so concurrent workers that
+        were throttled together don't all retry at the same moment.
+        """
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            return 2 ** attempt + random.uniform(0, 1)
+
     def search_places(self, query: str, place_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Search for places by name."""
         params = {"q": query}
@@ -38,9 +227,11 @@ class iNatClient:
         return result.get("results", [])
 
     def get_place(self, place_id: int) -> Dict[str, Any]:
-        """Get detailed information about a specific place."""
-        result = self._make_request(f"places/{place_id}")
-        return result.get("results", [{}])[0]
+        """Get detailed information about a specific place (memoized per client)."""
+        if place_id not in self._place_info_cache:
+            result = self._make_request(f"places/{place_id}")
+            self._place_info_cache[place_id] = result.get("results", [{}])[0]
+        return self._place_info_cache[place_id]
 
     def search_taxa(self, query: str, rank: Optional[str] = None) -> List[Dict[str, Any]]:
         """Search for taxa by name."""
@@ -51,16 +242,43 @@ class iNatClient:
         result = self._make_request("taxa", params)
         return result.get("results", [])
 
+    # The taxa/{ids} endpoint accepts at most this many IDs per request
+    TAXA_BATCH_SIZE = 30
+
+    def get_taxa(self, taxon_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Get full taxon records (including ancestor_ids) for many taxon IDs.
+
+        IDs are sent in batches of TAXA_BATCH_SIZE, fetched concurrently.
+        """
+        taxon_ids = list(taxon_ids)
+        batches = [
+            taxon_ids[i:i + self.TAXA_BATCH_SIZE]
+            for i in range(0, len(taxon_ids), self.TAXA_BATCH_SIZE)
+        ]
+        if not batches:
+            return []
+
+        def fetch(batch: List[int]) -> List[Dict[str, Any]]:
+            return self._make_request(f"taxa/{self._id_list(batch)}").get("results", [])
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            return [taxon for results in executor.map(fetch, batches) for taxon in results]
+
     def get_observations(self,
                         place_id: Optional[int] = None,
-                        taxon_id: Optional[int] = None,
+                        taxon_id: Optional[Union[int, Iterable[int]]] = None,
                         taxon_name: Optional[str] = None,
                         d1: Optional[str] = None,
                         d2: Optional[str] = None,
                         per_page: int = 200,
                         page: int = 1,
                         **kwargs) -> Dict[str, Any]:
-        """Get observations with various filters."""
+        """
+        Get observations with various filters.
+
+        taxon_id may be a single ID or several, which the API matches as "any of".
+        """
         params = {
             "per_page": per_page,
             "page": page
@@ -69,7 +287,7 @@ class iNatClient:
         if place_id:
             params["place_id"] = place_id
         if taxon_id:
-            params["taxon_id"] = taxon_id
+            params["taxon_id"] = self._id_list(taxon_id)
         if taxon_name:
             params["taxon_name"] = taxon_name
         if d1:
@@ -82,9 +300,18 @@ class iNatClient:
 
         return self._make_request("observations", params)
 
+    def count_observations(self, **filters) -> int:
+        """
+        Count observations matching the filters without downloading any of them.
+
+        Accepts the same filters as get_observations; uses per_page=0 so the API
+        only returns total_results.
+        """
+        return self.get_observations(per_page=0, **filters).get("total_results", 0)
+
     def get_species_counts(self,
                           place_id: Optional[int] = None,
-                          taxon_id: Optional[int] = None,
+                          taxon_id: Optional[Union[int, Iterable[int]]] = None,
                           d1: Optional[str] = None,
                           d2: Optional[str] = None,
                           iconic_taxon: Optional[str] = None,
@@ -96,7 +323,8 @@ class iNatClient:
 
         This endpoint returns aggregated counts of species/taxa without fetching
         individual observations. Uses leaf_taxa=true to include all taxonomic ranks
-        (genus, family, etc.), not just species-level identifications.
+        (genus, family, etc.), not just species-level identifications. taxon_id
+        may be several IDs, so one request can cover a whole batch of taxa.
         """
         params = {
             "per_page": per_page,
@@ -107,7 +335,7 @@ class iNatClient:
         if place_id:
             params["place_id"] = place_id
         if taxon_id:
-            params["taxon_id"] = taxon_id
+            params["taxon_id"] = self._id_list(taxon_id)
         if d1:
             params["d1"] = d1
         if d2:
@@ -119,42 +347,97 @@ class iNatClient:
 
         return self._make_request("observations/species_counts", params)
 
-    def resolve_place(self, place_name: str) -> int:
-        """Resolve a place name to a place ID, preferring political boundaries."""
-        places = self.search_places(place_name)
+    def iter_observations(self, per_page: int = 200, max_pages: Optional[int] = None,
+                          **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every observation matching the filters, one page at a time.
 
-        if not places:
-            raise PlaceNotFoundError(f"No places found for '{place_name}'")
+        Accepts the same filters as get_observations. Results are yielded as
+        soon as their page arrives, so callers can aggregate without building
+        one combined list; at most max_concurrent pages are fetched ahead of
+        the caller.
+        """
+        for results in self._iter_pages(self.get_observations, per_page, max_pages, **filters):
+            yield from results
 
-        # Place type mapping from iNaturalist source code
-        # https://github.com/inaturalist/inaturalist/blob/main/app/models/place.rb
-        PLACE_TYPE_MAPPING = {
-            12: "country",
-            8: "state",
-            9: "county",
-            7: "town",
-            103: "province",
-            100: "open_space",
-            # Add more mappings as needed
-        }
+    def get_all_observations(self, per_page: int = 200, max_pages: Optional[int] = None,
+                             **filters) -> List[Dict[str, Any]]:
+        """
+        Get every page of observations matching the filters.
 
-        # Prioritize places by type (countries, states, counties)
-        priority_types = ["country", "state", "county", "province"]
+        Accepts the same filters as get_observations. See _iter_pages for how
+        pages are fetched.
+        """
+        return list(self.iter_observations(per_page, max_pages, **filters))
 
-        for place_type in priority_types:
-            for place in places:
-                numeric_place_type = place.get("place_type")
-                place_type_name = PLACE_TYPE_MAPPING.get(numeric_place_type, "").lower()
-                if place_type_name == place_type and place_name.lower() in place.get("name", "").lower():
-                    return place["id"]
+    def iter_species_counts(self, per_page: int = 500, max_pages: Optional[int] = None,
+                            **filters) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every species count matching the filters, one page at a time.
 
-        # If no priority match, return the first exact name match
-        for place in places:
-            if place.get("name", "").lower() == place_name.lower():
-                return place["id"]
+        Accepts the same filters as get_species_counts. Only the first page is
+        requested before the first result is yielded.
+        """
+        for results in self._iter_pages(self.get_species_counts, per_page, max_pages, **filters):
+            yield from results
 
-        # If no exact match, return the first result
-        return places[0]["id"]
+    def get_all_species_counts(self, per_page: int = 500, max_pages: Optional[int] = None,
+                               **filters) -> List[Dict[str, Any]]:
+        """
+        Get every page of species counts matching the filters.
+
+        Accepts the same filters as get_species_counts. See _iter_pages for
+        how pages are fetched.
+        """
+        return list(self.iter_species_counts(per_page, max_pages, **filters))
+
+    def _iter_pages(self,
+                    fetch: Callable[..., Dict[str, Any]],
+                    per_page: int,
+                    max_pages: Optional[int] = None,
+                    **filters) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the results list of every page of a paginated endpoint, in page order.
+
+        The first page tells us how many pages there are; the remaining pages
+        are then requested concurrently, at most max_concurrent pages ahead of
+        the caller (and paced by the rate limiter). If the caller stops early
+        or a page fails, pages not yet started are never requested.
+        """
+        first = fetch(per_page=per_page, page=1, **filters)
+        results = first.get("results", [])
+        if not results:
+            return
+        yield results
+
+        # The API may cap per_page below what was asked for
+        page_size = first.get("per_page") or per_page
+        total_pages = math.ceil(first.get("total_results", 0) / page_size)
+        if max_pages is not None:
+            total_pages = min(total_pages, max_pages)
+
+        if total_pages > 1:
+            executor = ThreadPoolExecutor(max_workers=self.max_concurrent)
+            pages = iter(range(2, total_pages + 1))
+
+            def submit(page: int):
+                return executor.submit(fetch, per_page=per_page, page=page, **filters)
+
+            pending = deque(submit(page) for page in islice(pages, self.max_concurrent))
+            try:
+                while pending:
+                    response = pending.popleft().result()
+                    # Keep the window full while the caller works through this page
+                    for page in islice(pages, 1):
+                        pending.append(submit(page))
+                    yield response.get("results", [])
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def resolve_place(self, place_name: str) -> int:
+        """Resolve a place name to a place ID, preferring political boundaries."""
+        place_id, _ = self.resolve_place_with_info(place_name)
+        return place_id
 
     def resolve_place_with_info(self, place_name: str) -> tuple[int, dict]:
         """
@@ -167,63 +450,77 @@ class iNatClient:
                 - display_name: The full display name
                 - place_type: The place type code
                 - matched_as: How the place was matched (priority/exact/fallback)
+
+        Common regions (see inat_diff.lookups) are answered from a built-in table;
+        other results are memoized per client, keyed on the case-insensitive name.
         """
+        key = place_name.strip().lower()
+        if key in KNOWN_PLACES:
+            place_id, name, display_name, place_type = KNOWN_PLACES[key]
+            return place_id, {
+                "id": place_id,
+                "name": name,
+                "display_name": display_name,
+                "place_type": place_type,
+                "matched_as": "known place"
+            }
+
+        if key not in self._place_cache:
+            self._place_cache[key] = self._lookup_place(place_name.strip())
+        place_id, place_info = self._place_cache[key]
+        return place_id, dict(place_info)
+
+    def _lookup_place(self, place_name: str) -> tuple[int, dict]:
+        """Search the API for a place name and pick the best matching place."""
         places = self.search_places(place_name)
 
         if not places:
             raise PlaceNotFoundError(f"No places found for '{place_name}'")
 
-        # Place type mapping from iNaturalist source code
-        # https://github.com/inaturalist/inaturalist/blob/main/app/models/place.rb
-        PLACE_TYPE_MAPPING = {
-            12: "country",
-            8: "state",
-            9: "county",
-            7: "town",
-            103: "province",
-            100: "open_space",
-            # Add more mappings as needed
-        }
+        needle = place_name.lower()
+
+        # Bucket places by type once, then only scan the buckets we prefer
+        by_type: Dict[Any, List[Dict[str, Any]]] = {}
+        for place in places:
+            by_type.setdefault(place.get("place_type"), []).append(place)
 
         # Prioritize places by type (countries, states, counties)
-        priority_types = ["country", "state", "county", "province"]
-
-        for place_type in priority_types:
-            for place in places:
-                numeric_place_type = place.get("place_type")
-                place_type_name = PLACE_TYPE_MAPPING.get(numeric_place_type, "").lower()
-                if place_type_name == place_type and place_name.lower() in place.get("name", "").lower():
-                    return place["id"], {
-                        "id": place["id"],
-                        "name": place.get("name"),
-                        "display_name": place.get("display_name"),
-                        "place_type": place.get("place_type"),
-                        "matched_as": f"priority ({place_type})"
-                    }
+        for type_code, type_name in PRIORITY_PLACE_TYPES:
+            for place in by_type.get(type_code, ()):
+                if needle in place.get("name", "").lower():
+                    return place["id"], self._place_info(place, f"priority ({type_name})")
 
         # If no priority match, return the first exact name match
         for place in places:
-            if place.get("name", "").lower() == place_name.lower():
-                return place["id"], {
-                    "id": place["id"],
-                    "name": place.get("name"),
-                    "display_name": place.get("display_name"),
-                    "place_type": place.get("place_type"),
-                    "matched_as": "exact name match"
-                }
+            if place.get("name", "").lower() == needle:
+                return place["id"], self._place_info(place, "exact name match")
 
         # If no exact match, return the first result
         first_place = places[0]
-        return first_place["id"], {
-            "id": first_place["id"],
-            "name": first_place.get("name"),
-            "display_name": first_place.get("display_name"),
-            "place_type": first_place.get("place_type"),
-            "matched_as": "fallback (first result)"
+        return first_place["id"], self._place_info(first_place, "fallback (first result)")
+
+    @staticmethod
+    def _place_info(place: Dict[str, Any], matched_as: str) -> dict:
+        """Summarise a place search result for resolve_place_with_info."""
+        return {
+            "id": place["id"],
+            "name": place.get("name"),
+            "display_name": place.get("display_name"),
+            "place_type": place.get("place_type"),
+            "matched_as": matched_as
         }
 
     def resolve_taxon(self, taxon_name: str) -> int:
-        """Resolve a taxon name to a taxon ID."""
+        """Resolve a taxon name to a taxon ID (iconic taxa built in, others memoized per client)."""
+        key = taxon_name.strip().lower()
+        if key in KNOWN_TAXA:
+            return KNOWN_TAXA[key]
+        if key not in self._taxon_cache:
+            self._taxon_cache[key] = self._lookup_taxon(taxon_name.strip())
+        return self._taxon_cache[key]
+
+    def _lookup_taxon(self, taxon_name: str) -> int:
+        """Search the API for a taxon name and pick the best matching taxon."""
         taxa = self.search_taxa(taxon_name)
 
         if not taxa:
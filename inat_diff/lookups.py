@@ -0,0 +1,49 @@
+"""Well-known iNaturalist places and taxa that can be resolved without an API call."""
+
+# Place type codes from iNaturalist source code
+# https://github.com/inaturalist/inaturalist/blob/main/app/models/place.rb
+COUNTRY = 12
+STATE = 8
+COUNTY = 9
+TOWN = 7
+PROVINCE = 103
+OPEN_SPACE = 100
+
+# Place types preferred when a search returns several places, best first
+PRIORITY_PLACE_TYPES = (
+    (COUNTRY, "country"),
+    (STATE, "state"),
+    (COUNTY, "county"),
+    (PROVINCE, "province"),
+)
+
+# Lowercase place name -> (place_id, name, display_name, place_type)
+#
+# Only add places whose name unambiguously refers to the political boundary
+# that resolve_place_with_info would pick anyway; iNaturalist place IDs are
+# stable, so entries never need refreshing.
+KNOWN_PLACES = {
+    "united states": (1, "United States", "United States", COUNTRY),
+    "california": (14, "California", "California, US", STATE),
+    "florida": (21, "Florida", "Florida, US", STATE),
+    "oregon": (10, "Oregon", "Oregon, US", STATE),
+    "texas": (18, "Texas", "Texas, US", STATE),
+    "washington": (46, "Washington", "Washington, US", STATE),
+}
+
+# Lowercase scientific name -> taxon_id for iNaturalist's iconic taxa
+KNOWN_TAXA = {
+    "animalia": 1,
+    "aves": 3,
+    "amphibia": 20978,
+    "reptilia": 26036,
+    "mammalia": 40151,
+    "actinopterygii": 47178,
+    "mollusca": 47115,
+    "arachnida": 47119,
+    "insecta": 47158,
+    "plantae": 47126,
+    "fungi": 47170,
+    "protozoa": 47686,
+    "chromista": 48222,
+}
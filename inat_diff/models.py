@@ -0,0 +1,68 @@
+"""Small record types shared by the query engine."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Shared stand-in for results without a taxon; never modified
+_NO_TAXON: Dict[str, Any] = {}
+
+
+@dataclass(slots=True)
+class SpeciesRecord:
+    """
+    One taxon from a species_counts response.
+
+    Historical lookbacks can return tens of thousands of taxa, so these are
+    kept as slotted objects rather than dicts while the comparison runs.
+    Results handed back to callers are converted with to_dict().
+    """
+
+    id: int
+    name: Optional[str] = None
+    preferred_common_name: Optional[str] = None
+    rank: Optional[str] = None
+    iconic_taxon: Optional[str] = None
+    ancestor_ids: List[int] = field(default_factory=list)
+    observation_count: int = 0
+
+    @classmethod
+    def from_species_count(cls, result: Dict[str, Any]) -> Optional["SpeciesRecord"]:
+        """Build a record from a species_counts result (None if it has no taxon id)."""
+        taxon = result.get("taxon") or _NO_TAXON
+        get = taxon.get
+        taxon_id = get("id")
+        if not taxon_id:
+            return None
+        return cls(
+            id=taxon_id,
+            name=get("name"),
+            preferred_common_name=get("preferred_common_name"),
+            rank=get("rank"),
+            iconic_taxon=get("iconic_taxon_name"),
+            ancestor_ids=get("ancestor_ids", []),
+            observation_count=result.get("count", 0)
+        )
+
+    def to_dict(self, **extra) -> Dict[str, Any]:
+        """Return the record as a plain dict, with any extra fields appended."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "preferred_common_name": self.preferred_common_name,
+            "rank": self.rank,
+            "iconic_taxon": self.iconic_taxon,
+            "ancestor_ids": self.ancestor_ids,
+            "observation_count": self.observation_count,
+            **extra
+        }
+
+
+@dataclass(frozen=True)
+class QueryContext:
+    """The resolved inputs of a single-taxon query, worked out once per query."""
+
+    taxon_name: str
+    taxon_id: int
+    place_id: int
+    start_date: str
+    end_date: str
@@ -1,9 +1,10 @@
 """Main query functionality for species detection."""
 
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional
 from .client import iNatClient
-from .utils import parse_time_period, normalize_taxon_name
+from .utils import lookback_period, normalize_taxon_name, parse_time_period, warn_rate_limit_ignored
 from .exceptions import iNatAPIError
+from .models import QueryContext, SpeciesRecord
 
 
 class SpeciesQuery:
@@ -13,11 +14,26 @@ class SpeciesQuery:
         """Initialize with an optional client instance."""
         self.client = client or iNatClient()
 
+    def _resolve_context(self, taxon_name: str, time_period: str, region: str) -> QueryContext:
+        """Parse the time period and resolve the place and taxon IDs for a query."""
+        normalized_taxon = normalize_taxon_name(taxon_name)
+        start_date, end_date = parse_time_period(time_period)
+        place_id = self.client.resolve_place(region)
+        taxon_id = self.client.resolve_taxon(normalized_taxon)
+        return QueryContext(
+            taxon_name=normalized_taxon,
+            taxon_id=taxon_id,
+            place_id=place_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+
     def query_species_in_period(self,
                                taxon_name: str,
                                time_period: str,
                                region: str,
-                               include_subspecies: bool = True) -> Dict[str, Any]:
+                               include_subspecies: bool = True,
+                               context: Optional[QueryContext] = None) -> Dict[str, Any]:
         """
         Query for species observations in a specific time period and region.
 
@@ -26,38 +42,34 @@ class SpeciesQuery:
             time_period: Time period string (e.g., "last 30 days", "this month")
             region: Name of the region (country, state, county)
             include_subspecies: Whether to include subspecies in results
+            context: Already resolved inputs for this query (see _resolve_context)
 
         Returns:
             Dictionary containing query results and metadata
         """
-        # Parse inputs
-        normalized_taxon = normalize_taxon_name(taxon_name)
-        start_date, end_date = parse_time_period(time_period)
-
-        # Resolve place and taxon IDs
-        place_id = self.client.resolve_place(region)
-        taxon_id = self.client.resolve_taxon(normalized_taxon)
+        if context is None:
+            context = self._resolve_context(taxon_name, time_period, region)
 
         # Get observations for the specified period
         observations = self.client.get_observations(
-            place_id=place_id,
-            taxon_id=taxon_id,
-            d1=start_date,
-            d2=end_date
+            place_id=context.place_id,
+            taxon_id=context.taxon_id,
+            d1=context.start_date,
+            d2=context.end_date
         )
 
         # Get species information
-        place_info = self.client.get_place(place_id)
+        place_info = self.client.get_place(context.place_id)
 
         return {
             "query": {
-                "taxon_name": normalized_taxon,
-                "taxon_id": taxon_id,
+                "taxon_name": context.taxon_name,
+                "taxon_id": context.taxon_id,
                 "region": region,
-                "place_id": place_id,
+                "place_id": context.place_id,
                 "time_period": time_period,
-                "start_date": start_date,
-                "end_date": end_date
+                "start_date": context.start_date,
+                "end_date": context.end_date
             },
             "place_info": place_info,
             "observations": observations,
@@ -84,39 +96,43 @@ class SpeciesQuery:
         Returns:
             Dictionary with results and analysis
         """
-        from datetime import datetime, timedelta
+        # Parse the period and resolve place and taxon once for both queries
+        context = self._resolve_context(taxon_name, time_period, region)
 
         # Get current period observations
-        current_results = self.query_species_in_period(taxon_name, time_period, region)
+        current_results = self.query_species_in_period(
+            taxon_name, time_period, region, context=context
+        )
 
+        # current_results is ours, so extend it in place rather than copying it
         if current_results["total_results"] == 0:
-            return {
-                **current_results,
+            current_results.update({
                 "historical_observations": {"total_results": 0},
                 "is_new_to_region": False,
                 "lookback_period": "N/A",
                 "analysis": "No observations found in the specified period"
-            }
+            })
+            return current_results
 
         # Check historical presence
-        start_date, end_date = parse_time_period(time_period)
-        historical_end = datetime.strptime(start_date, "%Y-%m-%d") - timedelta(days=1)
-        historical_start = historical_end - timedelta(days=365 * lookback_years)
-
-        historical_observations = self.client.get_observations(
-            place_id=current_results["query"]["place_id"],
-            taxon_id=current_results["query"]["taxon_id"],
-            d1=historical_start.strftime("%Y-%m-%d"),
-            d2=historical_end.strftime("%Y-%m-%d")
-        )
+        hist_d1, hist_d2 = lookback_period(context.start_date, lookback_years)
+
+        # Only the historical total matters, so don't download any observations
+        historical_observations = {
+            "total_results": self.client.count_observations(
+                place_id=context.place_id,
+                taxon_id=context.taxon_id,
+                d1=hist_d1,
+                d2=hist_d2
+            )
+        }
 
-        is_new = historical_observations.get("total_results", 0) == 0
+        is_new = historical_observations["total_results"] == 0
 
-        return {
-            **current_results,
+        current_results.update({
             "historical_observations": historical_observations,
             "is_new_to_region": is_new,
-            "lookback_period": f"{historical_start.strftime('%Y-%m-%d')} to {historical_end.strftime('%Y-%m-%d')}",
+            "lookback_period": f"{hist_d1} to {hist_d2}",
             "analysis": (
                 f"Species appears to be NEW to {region} in the specified period. "
                 f"No observations found in the previous {lookback_years} years."
@@ -124,7 +140,8 @@ class SpeciesQuery:
                 f"Species was previously observed in {region}. "
                 f"Found {historical_observations.get('total_results', 0)} historical observations."
             )
-        }
+        })
+        return current_results
 
     def get_all_species_in_period(self,
                                  time_period: str,
@@ -133,51 +150,54 @@ class SpeciesQuery:
         """
         Get all species observed in a region during a time period.
 
+        The species list holds leaf taxa only (see get_species_counts): a taxon
+        is left out when one of its descendants was also observed, e.g. a genus
+        whose species were seen. total_observations counts every observation
+        in the period, whatever its taxon and whether or not page_limit cut
+        the species list short.
+
         Args:
             time_period: Time period string
             region: Name of the region
-            page_limit: Maximum number of pages to fetch (None = fetch all pages)
+            page_limit: Maximum number of species_counts pages (500 taxa each) to
+                fetch (None = fetch all pages)
 
         Returns:
-            Dictionary with all species found
+            Dictionary with all species found, most observed first
         """
         start_date, end_date = parse_time_period(time_period)
         place_id = self.client.resolve_place(region)
 
-        all_observations = []
-        page = 1
+        # species_counts returns one row per taxon (most observed first), so
+        # there is no need to download and tally individual observations
+        results = self.client.get_all_species_counts(
+            place_id=place_id,
+            d1=start_date,
+            d2=end_date,
+            per_page=500,
+            max_pages=page_limit
+        )
 
-        while page_limit is None or page <= page_limit:
-            observations = self.client.get_observations(
-                place_id=place_id,
-                d1=start_date,
-                d2=end_date,
-                page=page,
-                per_page=200
-            )
+        # Leaf rows leave out observations identified above a leaf taxon, so
+        # summing their counts would undercount; ask for the total instead
+        total_observations = self.client.count_observations(
+            place_id=place_id, d1=start_date, d2=end_date
+        )
 
-            results = observations.get("results", [])
-            if not results:
-                break
-
-            all_observations.extend(results)
-            page += 1
-
-        # Extract unique species
-        unique_species = {}
-        for obs in all_observations:
-            taxon = obs.get("taxon")
-            if taxon and taxon.get("id"):
-                species_id = taxon["id"]
-                if species_id not in unique_species:
-                    unique_species[species_id] = {
-                        "id": species_id,
-                        "name": taxon.get("name"),
-                        "preferred_common_name": taxon.get("preferred_common_name"),
-                        "rank": taxon.get("rank"),
-                        "observation_count": 0
-                    }
-                unique_species[species_id]["observation_count"] += 1
+        species = []
+        seen = set()
+        for result in results:
+            taxon = result.get("taxon")
+            if taxon and taxon.get("id") and taxon["id"] not in seen:
+                seen.add(taxon["id"])
+                count = result.get("count", 0)
+                species.append({
+                    "id": taxon["id"],
+                    "name": taxon.get("name"),
+                    "preferred_common_name": taxon.get("preferred_common_name"),
+                    "rank": taxon.get("rank"),
+                    "observation_count": count
+                })
 
         return {
             "query": {
@@ -187,17 +207,16 @@ class SpeciesQuery:
                 "start_date": start_date,
                 "end_date": end_date
             },
-            "species_count": len(unique_species),
-            "total_observations": len(all_observations),
-            "species": list(unique_species.values())
+            "species_count": len(species),
+            "total_observations": total_observations,
+            "species": species
         }
 
     def find_all_new_species_in_period(self,
                                        time_period: str,
                                        region: str,
                                        lookback_years: int = 20,
-                                       rate_limit: float = 1.2,  # iNaturalist API limit: 60-100 req/min (https://www.inaturalist.org/pages/api+recommended+practices)
-                                                                 # 1.2 seconds = 50 req/min, conservative to avoid throttling
+                                       rate_limit: Optional[float] = None,
                                        verbose: bool = False) -> Dict[str, Any]:
         """
         Find all species that appear to be new to a region during a time period.
@@ -205,27 +224,32 @@ class SpeciesQuery:
         This is the main use case: "what new species have been seen this month
         in Oregon that have not previously been observed in Oregon?"
 
-        Uses two species_counts queries and compares them - much faster than
-        checking each species individually.
+        Uses two species_counts queries (run concurrently) and compares them -
+        much faster than checking each species individually. The historical
+        query is skipped when the current period has no species. Requests are
+        paced by the client's rate limit (see iNatClient's rate_limit).
 
         Args:
             time_period: Recent time period to check
             region: Name of the region
             lookback_years: How many years to look back for historical data
-            rate_limit: Seconds to wait between API calls (default: 1.2 = 50 req/min)
+            rate_limit: Deprecated and ignored; set it on the client instead
             verbose: Print progress information
 
         Returns:
             Dictionary with new species found and analysis
         """
-        from datetime import datetime, timedelta
-        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from itertools import islice, takewhile
         import sys
+        import threading
+
+        if rate_limit is not None:
+            warn_rate_limit_ignored("find_all_new_species_in_period")
 
         # Parse dates
         start_date, end_date = parse_time_period(time_period)
-        historical_end = datetime.strptime(start_date, "%Y-%m-%d") - timedelta(days=1)
-        historical_start = historical_end - timedelta(days=365 * lookback_years)
+        hist_d1, hist_d2 = lookback_period(start_date, lookback_years)
 
         place_id, place_info = self.client.resolve_place_with_info(region)
 
@@ -239,99 +263,103 @@ class SpeciesQuery:
                 print(f"  ⚠️  WARNING: No exact match found, using first result", file=sys.stderr)
             print(file=sys.stderr)
 
-        # Helper function to fetch all species with retry logic
-        def fetch_all_species(period_start: str, period_end: str, period_name: str):
-            species_map = {}
-            page = 1
-            no_more_results = False
-
-            while not no_more_results:
-                max_retries = 5
-                retry_count = 0
-                success = False
-
-                while retry_count < max_retries and not success:
-                    try:
-                        counts = self.client.get_species_counts(
-                            place_id=place_id,
-                            d1=period_start,
-                            d2=period_end,
-                            per_page=500,
-                            page=page
-                        )
-
-                        results = counts.get("results", [])
-                        if not results:
-                            no_more_results = True
-                            success = True
-                            break
-
-                        for taxon in results:
-                            taxon_id = taxon.get("taxon", {}).get("id")
-                            if taxon_id:
-                                species_map[taxon_id] = {
-                                    "id": taxon_id,
-                                    "name": taxon.get("taxon", {}).get("name"),
-                                    "preferred_common_name": taxon.get("taxon", {}).get("preferred_common_name"),
-                                    "rank": taxon.get("taxon", {}).get("rank"),
-                                    "iconic_taxon": taxon.get("taxon", {}).get("iconic_taxon_name"),
-                                    "ancestor_ids": taxon.get("taxon", {}).get("ancestor_ids", []),
-                                    "observation_count": taxon.get("count", 0)
-                                }
-
-                        success = True
-                        page += 1
-                        time.sleep(rate_limit)
-
-                    except Exception as e:
-                        retry_count += 1
-                        if retry_count < max_retries:
-                            backoff_time = rate_limit * (2 ** retry_count)
-                            if verbose:
-                                print(f"  Error fetching {period_name} (page {page}): {e}", file=sys.stderr)
-                                print(f"  Retrying in {backoff_time:.1f}s (attempt {retry_count}/{max_retries})...", file=sys.stderr)
-                            time.sleep(backoff_time)
-                        else:
-                            error_msg = f"Failed to fetch {period_name} (page {page}) after {max_retries} retries: {e}"
-                            if verbose:
-                                print(f"  {error_msg}", file=sys.stderr)
-                            raise iNatAPIError(error_msg)
-
+        # Helper functions to fetch all species in a period. Transient failures
+        # (HTTP 429/5xx, dropped connections) are retried inside the client.
+        def species_rows(period_start: str, period_end: str, period_name: str):
+            try:
+                yield from self.client.iter_species_counts(
+                    place_id=place_id, d1=period_start, d2=period_end, per_page=500
+                )
+            except iNatAPIError as e:
+                error_msg = f"Failed to fetch {period_name}: {e}"
+                if verbose:
+                    print(f"  {error_msg}", file=sys.stderr)
+                raise iNatAPIError(error_msg)
+
+        def collect_species(results, species_map=None):
+            species_map = {} if species_map is None else species_map
+            for result in results:
+                record = SpeciesRecord.from_species_count(result)
+                # Pages are fetched concurrently, so a taxon whose rank shifted
+                # between requests can show up twice; keep the first row
+                if record is not None and record.id not in species_map:
+                    species_map[record.id] = record
             return species_map
 
-        # Step 1: Get all species in the current period
+        # Set when the current period fails, so the historical sweep stops early
+        cancelled = threading.Event()
+
+        def fetch_all_species(period_start: str, period_end: str, period_name: str):
+            results = species_rows(period_start, period_end, period_name)
+            try:
+                return collect_species(takewhile(lambda _: not cancelled.is_set(), results))
+            finally:
+                # Stops the client from requesting any pages still queued
+                results.close()
+
+        # Steps 1 and 2: Get all species in the current and historical periods.
+        # The historical query is by far the largest, and with nothing in the
+        # current period there is nothing to compare it against. So wait for the
+        # first page of the current period, then fetch the rest of it and the
+        # historical period side by side only if it had any species.
         if verbose:
             print(f"Fetching species in {region} during {time_period}...", file=sys.stderr)
-
-        current_species_map = fetch_all_species(start_date, end_date, "current period")
+        current_results = species_rows(start_date, end_date, "current period")
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            # Any row means page 1 had results, even if this one has no taxon
+            first_rows = list(islice(current_results, 1))
+            current_species_map = collect_species(first_rows)
+
+            historical_future = None
+            if first_rows:
+                if verbose:
+                    print(f"Fetching historical species (lookback {lookback_years} years)...", file=sys.stderr)
+                historical_future = executor.submit(
+                    fetch_all_species, hist_d1, hist_d2, "historical period"
+                )
+
+            collect_species(current_results, current_species_map)
+            historical_species_map = historical_future.result() if historical_future else {}
+        except BaseException:
+            # Without the current period the historical one is useless, so
+            # don't wait for it to finish before reporting the error
+            cancelled.set()
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
         if verbose:
             print(f"Found {len(current_species_map)} species in current period", file=sys.stderr)
-
-        # Step 2: Get all species in the historical period
-        if verbose:
-            print(f"Fetching historical species (lookback {lookback_years} years)...", file=sys.stderr)
-
-        historical_species_map = fetch_all_species(
-            historical_start.strftime("%Y-%m-%d"),
-            historical_end.strftime("%Y-%m-%d"),
-            "historical period"
-        )
-
-        if verbose:
             print(f"Found {len(historical_species_map)} species in historical period", file=sys.stderr)
             print(f"Comparing species lists (including ancestry)...", file=sys.stderr)
 
-        # Step 3: Build a set of all historical taxon IDs that were observed
-        # This includes both the taxa themselves AND any taxa that are ancestors
-        # of observed taxa (to handle genus-level IDs vs species-level IDs)
-        historical_taxon_ids = set(historical_species_map.keys())
-
-        # Also build a set of all taxon IDs that appear in ancestor_ids of historical taxa
-        # This helps us detect when a higher-level taxon (e.g., genus) was observed
-        # in the current period but only species-level observations exist historically
+        # Some species_counts rows come back without their ancestry, which would
+        # hide them from the ancestor matching below; fill those in with
+        # batched taxa lookups
+        missing_ancestry = [
+            taxon_id for taxon_id, record in historical_species_map.items()
+            if not record.ancestor_ids
+        ]
+        if missing_ancestry:
+            if verbose:
+                print(f"Fetching ancestry for {len(missing_ancestry)} historical taxa...", file=sys.stderr)
+            for taxon in self.client.get_taxa(missing_ancestry):
+                record = historical_species_map.get(taxon.get("id"))
+                if record is not None:
+                    record.ancestor_ids = taxon.get("ancestor_ids") or []
+
+        # Step 3: Index historical observations by ancestor. Each taxon that appears
+        # in the ancestor_ids of a historical taxon maps to the total historical
+        # observation count of its descendants. This lets us detect, in one dict
+        # lookup, when a higher-level taxon (e.g., genus) was observed in the
+        # current period but only species-level observations exist historically
+        descendant_counts: Dict[int, int] = {}
         for historical_taxon in historical_species_map.values():
-            historical_taxon_ids.update(historical_taxon.get("ancestor_ids", []))
+            count = historical_taxon.observation_count
+            for ancestor_id in historical_taxon.ancestor_ids:
+                descendant_counts[ancestor_id] = descendant_counts.get(ancestor_id, 0) + count
 
         # Step 4: Compare - find species in current but NOT in historical
         new_species = []
@@ -345,28 +373,20 @@ class SpeciesQuery:
             # First check: exact match
             if taxon_id in historical_species_map:
                 found_historically = True
-                historical_count = historical_species_map[taxon_id]["observation_count"]
+                historical_count = historical_species_map[taxon_id].observation_count
 
             # Second check: is this taxon an ancestor of any historical observations?
             # This handles the case where current period has genus-level ID but
             # historical period has species-level IDs
-            elif taxon_id in historical_taxon_ids:
+            elif taxon_id in descendant_counts:
                 found_historically = True
                 # Count all historical observations of descendants
-                for hist_taxon_id, hist_species in historical_species_map.items():
-                    if taxon_id in hist_species.get("ancestor_ids", []):
-                        historical_count += hist_species["observation_count"]
+                historical_count = descendant_counts[taxon_id]
 
             if found_historically:
-                established_species.append({
-                    **species,
-                    "historical_count": historical_count
-                })
+                established_species.append(species.to_dict(historical_count=historical_count))
             else:
-                new_species.append({
-                    **species,
-                    "historical_count": 0
-                })
+                new_species.append(species.to_dict(historical_count=0))
 
         if verbose:
             print(f"Complete! Found {len(new_species)} new species", file=sys.stderr)
@@ -382,12 +402,12 @@ class SpeciesQuery:
                 "start_date": start_date,
                 "end_date": end_date
             },
-            "lookback_period": f"{historical_start.strftime('%Y-%m-%d')} to {historical_end.strftime('%Y-%m-%d')}",
+            "lookback_period": f"{hist_d1} to {hist_d2}",
             "lookback_years": lookback_years,
             "total_species_in_period": len(current_species_map),
             "new_species_count": len(new_species),
             "established_species_count": len(established_species),
             "new_species": new_species,
             "established_species": established_species,
-            "rate_limit_seconds": rate_limit
+            "rate_limit_seconds": self.client.rate_limit
         }
@@ -0,0 +1,79 @@
+"""Thread-safe rate limiting for iNaturalist API requests."""
+
+import threading
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """
+    Limit API calls to a number per rolling time window and cap concurrency.
+
+    Calls are only delayed once the window is full, so a request is never
+    slowed down just because the previous one returned quickly. Use it as a
+    context manager around each request:
+
+        with limiter:
+            response = session.get(url)
+    """
+
+    def __init__(self, max_calls: int = 50, period: float = 60.0, max_concurrent: int = 4):
+        """
+        Args:
+            max_calls: Maximum number of calls started within any `period` seconds
+            period: Length of the rolling window in seconds
+            max_concurrent: Maximum number of requests in flight at once
+        """
+        self.max_calls = max_calls
+        self.period = period
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._calls = deque()
+
+    def set_interval(self, seconds_per_call: float) -> None:
+        """Set the limit from an average number of seconds per call (0 = unlimited)."""
+        with self._lock:
+            if seconds_per_call > 0:
+                self.max_calls = max(1, round(self.period / seconds_per_call))
+            else:
+                self.max_calls = None
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the slot's timestamp for refund()."""
+        self._semaphore.acquire()
+        try:
+            return self._wait_for_slot()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self) -> None:
+        """Mark an in-flight request as finished."""
+        self._semaphore.release()
+
+    def refund(self, stamp: float) -> None:
+        """Give back a call slot whose request never reached the API (e.g. a cache hit)."""
+        with self._lock:
+            try:
+                self._calls.remove(stamp)
+            except ValueError:
+                pass  # Already aged out of the window
+
+    def _wait_for_slot(self) -> float:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if self.max_calls is None or len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return now
+                delay = self.period - (now - self._calls[0])
+            time.sleep(delay)
+
+    def __enter__(self) -> "RateLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
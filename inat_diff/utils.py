@@ -1,10 +1,44 @@
 """Utility functions for parsing time periods and other helpers."""
 
-import re
-from datetime import datetime, timedelta
-from typing import Tuple, Optional
+import json
+import warnings
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Tuple, Optional, Union
 from .exceptions import InvalidTimeFormatError
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def warn_rate_limit_ignored(function_name: str) -> None:
+    """Warn the caller of function_name that its deprecated rate_limit argument is ignored."""
+    warnings.warn(
+        f"{function_name}(rate_limit=...) is deprecated and ignored; set the rate limit on "
+        "the client instead, e.g. iNatClient(rate_limit=1.2)",
+        DeprecationWarning,
+        stacklevel=3
+    )
+
 
 def parse_time_period(time_str: str) -> Tuple[str, str]:
     """
@@ -20,72 +54,113 @@ def parse_time_period(time_str: str) -> Tuple[str, str]:
     Returns:
         Tuple of (start_date, end_date) in YYYY-MM-DD format
     """
-    time_str = time_str.strip().lower()
-    today = datetime.now()
+    # Relative periods depend on the current date, so it is part of the cache key
+    return _parse_time_period(" ".join(time_str.lower().split()), date.today())
+
+
+# Length of each "last/past N <unit>" unit in days (months approximated as 30 days
+# for simplicity); years are handled separately to keep calendar dates aligned
+_UNIT_DAYS = {"day": 1, "week": 7, "month": 30}
+
+
+@lru_cache(maxsize=256)
+def _parse_time_period(time_str: str, today: date) -> Tuple[str, str]:
+    """Parse a normalized (lowercase, single-spaced) time period relative to `today`."""
+    parts = time_str.split(" ")
 
     # Handle explicit date ranges
-    date_range_pattern = r'(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})'
-    match = re.match(date_range_pattern, time_str)
-    if match:
-        return match.group(1), match.group(2)
-
-    # Handle "this month/year"
-    if time_str == "this month":
-        start_date = today.replace(day=1)
-        if today.month == 12:
-            end_date = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            end_date = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
-        return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
-
-    if time_str == "last month":
-        # Get first day of current month, then go back one day to get last day of previous month
-        first_of_this_month = today.replace(day=1)
-        last_of_last_month = first_of_this_month - timedelta(days=1)
-        # Get first day of that month
-        first_of_last_month = last_of_last_month.replace(day=1)
-        return first_of_last_month.strftime("%Y-%m-%d"), last_of_last_month.strftime("%Y-%m-%d")
-
-    if time_str == "this year":
-        start_date = today.replace(month=1, day=1)
-        end_date = today.replace(month=12, day=31)
-        return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
-
-    if time_str == "last year":
-        start_date = today.replace(year=today.year - 1, month=1, day=1)
-        end_date = today.replace(year=today.year - 1, month=12, day=31)
-        return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+    if len(parts) == 3 and parts[1] == "to":
+        return _check_iso_date(parts[0], time_str), _check_iso_date(parts[2], time_str)
+
+    # Handle "this month/year" and "last month/year"
+    handler = _NAMED_PERIODS.get(time_str)
+    if handler is not None:
+        return handler(today)
 
     # Handle "last/past N period" patterns
-    period_pattern = r'(?:last|past)\s+(\d+)\s+(day|week|month|year)s?'
-    match = re.match(period_pattern, time_str)
-    if match:
-        number = int(match.group(1))
-        unit = match.group(2)
-
-        if unit == "day":
-            start_date = today - timedelta(days=number)
-        elif unit == "week":
-            start_date = today - timedelta(weeks=number)
-        elif unit == "month":
-            # Approximate months as 30 days for simplicity
-            start_date = today - timedelta(days=number * 30)
+    if len(parts) == 3 and parts[0] in ("last", "past") and parts[1].isdecimal():
+        number = int(parts[1])
+        unit = parts[2][:-1] if parts[2].endswith("s") else parts[2]
+
+        if unit in _UNIT_DAYS:
+            start_date = today - timedelta(days=number * _UNIT_DAYS[unit])
         elif unit == "year":
-            start_date = today.replace(year=today.year - number)
+            try:
+                start_date = today.replace(year=today.year - number)
+            except ValueError:
+                # February 29th in a non-leap year
+                start_date = today.replace(year=today.year - number, day=28)
+        else:
+            raise InvalidTimeFormatError(f"Unable to parse time period: '{time_str}'")
 
-        end_date = today
-        return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+        return start_date.isoformat(), today.isoformat()
 
     # Handle single numbers (assume days)
-    if time_str.isdigit():
-        days = int(time_str)
-        start_date = today - timedelta(days=days)
-        end_date = today
-        return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+    if time_str.isdecimal():
+        start_date = today - timedelta(days=int(time_str))
+        return start_date.isoformat(), today.isoformat()
 
     raise InvalidTimeFormatError(f"Unable to parse time period: '{time_str}'")
 
 
+def _this_month(today: date) -> Tuple[str, str]:
+    start_date = today.replace(day=1)
+    if today.month == 12:
+        end_date = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
+    else:
+        end_date = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
+    return start_date.isoformat(), end_date.isoformat()
+
+
+def _last_month(today: date) -> Tuple[str, str]:
+    # Get first day of current month, then go back one day to get last day of previous month
+    first_of_this_month = today.replace(day=1)
+    last_of_last_month = first_of_this_month - timedelta(days=1)
+    # Get first day of that month
+    first_of_last_month = last_of_last_month.replace(day=1)
+    return first_of_last_month.isoformat(), last_of_last_month.isoformat()
+
+
+def _this_year(today: date) -> Tuple[str, str]:
+    return f"{today.year}-01-01", f"{today.year}-12-31"
+
+
+def _last_year(today: date) -> Tuple[str, str]:
+    return f"{today.year - 1}-01-01", f"{today.year - 1}-12-31"
+
+
+# Periods named by a fixed phrase -> function of today's date
+_NAMED_PERIODS = {
+    "this month": _this_month,
+    "last month": _last_month,
+    "this year": _this_year,
+    "last year": _last_year,
+}
+
+
+def _check_iso_date(value: str, time_str: str) -> str:
+    """Return value if it is a valid YYYY-MM-DD date, otherwise raise InvalidTimeFormatError."""
+    try:
+        if len(value) == 10 and date.fromisoformat(value):
+            return value
+    except ValueError:
+        pass
+    raise InvalidTimeFormatError(f"Invalid date '{value}' in time period: '{time_str}'")
+
+
+@lru_cache(maxsize=256)
+def lookback_period(start_date: str, lookback_years: int) -> Tuple[str, str]:
+    """
+    Return the historical window ending the day before start_date.
+
+    The window spans 365 * lookback_years days. Both start_date and the
+    returned dates are YYYY-MM-DD strings.
+    """
+    historical_end = date.fromisoformat(start_date) - timedelta(days=1)
+    historical_start = historical_end - timedelta(days=365 * lookback_years)
+    return historical_start.isoformat(), historical_end.isoformat()
+
+
 def normalize_taxon_name(name: str) -> str:
     """Normalize a taxon name for API queries."""
     # Basic cleaning - remove extra whitespace, handle common formatting
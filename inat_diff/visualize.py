@@ -1,135 +1,150 @@
 """Generate HTML visualization from iNaturalist query results."""
 
 import argparse
+import hashlib
 import json
+import shutil
 import sys
+import threading
 import time
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, Optional
 
-import requests
+from .client import iNatClient
+from .exceptions import iNatAPIError
+from .utils import loads_json, warn_rate_limit_ignored
 
 
-API_BASE_URL = "https://api.inaturalist.org/v1/observations"
 QUALITY_PRIORITY = ("research", "needs_id", "casual")
 QUALITY_LABELS = {
     "research": "Research Grade",
     "needs_id": "Needs ID",
     "casual": "Casual",
 }
-REQUEST_TIMEOUT = 10
-
-
-HTML_TEMPLATE = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>iNaturalist Species Report: {title}</title>
-    <style>
-        body {{
+# Label for species whose quality grade couldn't be looked up
+QUALITY_ERROR_LABEL = "API Error"
+# Taxon IDs per species_counts request when looking up quality grades
+QUALITY_BATCH_SIZE = 200
+# Consecutive failed batches after which the remaining quality lookups are skipped
+QUALITY_MAX_FAILURES = 3
+# Seconds an in-process quality lookup is reused, for long-running embeddings
+QUALITY_CACHE_TTL = 60 * 60
+# Write buffer for the output report, so streamed chunks reach disk in large writes
+OUTPUT_BUFFER_SIZE = 1 << 20
+# Rendered reports reused by --cache, keyed by input file contents
+HTML_CACHE_DIR = iNatClient.DEFAULT_CACHE_PATH.parent / "html"
+
+_client: Optional[iNatClient] = None
+
+
+# Static stylesheet for every report; kept out of any format string so its
+# braces need no escaping
+PAGE_STYLE = """
+        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
             max-width: 1200px;
             margin: 0 auto;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .header {{
+        }
+        .header {
             background-color: #74ac00;
             color: white;
             padding: 20px;
             border-radius: 8px;
             margin-bottom: 20px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             margin: 0 0 10px 0;
-        }}
-        .header p {{
+        }
+        .header p {
             margin: 5px 0;
             opacity: 0.9;
-        }}
-        .summary {{
+        }
+        .summary {
             background-color: white;
             padding: 20px;
             border-radius: 8px;
             margin-bottom: 20px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .summary h2 {{
+        }
+        .summary h2 {
             margin-top: 0;
-        }}
-        .stats {{
+        }
+        .stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 15px;
             margin-top: 15px;
-        }}
-        .stat {{
+        }
+        .stat {
             background-color: #f8f8f8;
             padding: 15px;
             border-radius: 4px;
             border-left: 4px solid #74ac00;
-        }}
-        .stat-value {{
+        }
+        .stat-value {
             font-size: 24px;
             font-weight: bold;
             color: #333;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             font-size: 14px;
             color: #666;
             margin-top: 5px;
-        }}
-        .species-section {{
+        }
+        .species-section {
             background-color: white;
             padding: 20px;
             border-radius: 8px;
             margin-bottom: 20px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .species-section h2 {{
+        }
+        .species-section h2 {
             margin-top: 0;
             color: #333;
-        }}
-        .species-list {{
+        }
+        .species-list {
             list-style: none;
             padding: 0;
             margin: 0;
-        }}
-        .species-item {{
+        }
+        .species-item {
             padding: 15px;
             border-bottom: 1px solid #eee;
             display: flex;
             justify-content: space-between;
             align-items: center;
-        }}
-        .species-item:last-child {{
+        }
+        .species-item:last-child {
             border-bottom: none;
-        }}
-        .species-item:hover {{
+        }
+        .species-item:hover {
             background-color: #f8f8f8;
-        }}
-        .species-info {{
+        }
+        .species-info {
             flex: 1;
-        }}
-        .species-name {{
+        }
+        .species-name {
             font-size: 16px;
             font-weight: bold;
             color: #333;
-        }}
-        .species-name-latin {{
+        }
+        .species-name-latin {
             font-style: italic;
             color: #666;
             font-size: 14px;
             margin-left: 8px;
-        }}
-        .species-meta {{
+        }
+        .species-meta {
             font-size: 13px;
             color: #888;
             margin-top: 4px;
-        }}
-        .species-badge {{
+        }
+        .species-badge {
             display: inline-block;
             padding: 2px 8px;
             border-radius: 3px;
@@ -137,43 +152,43 @@ HTML_TEMPLATE = """<!DOCTYPE html>
             font-weight: bold;
             margin-right: 6px;
             text-transform: uppercase;
-        }}
-        .badge-new {{
+        }
+        .badge-new {
             background-color: #ff4444;
             color: white;
-        }}
-        .badge-rank {{
+        }
+        .badge-rank {
             background-color: #e8e8e8;
             color: #666;
-        }}
-        .badge-taxon {{
+        }
+        .badge-taxon {
             background-color: #d4edda;
             color: #155724;
-        }}
-        .species-stats {{
+        }
+        .species-stats {
             text-align: right;
             margin-left: 20px;
-        }}
-        .obs-count {{
+        }
+        .obs-count {
             font-size: 18px;
             font-weight: bold;
             color: #74ac00;
-        }}
-        .obs-label {{
+        }
+        .obs-label {
             font-size: 12px;
             color: #888;
-        }}
-        .historical-count {{
+        }
+        .historical-count {
             font-size: 13px;
             color: #666;
             margin-top: 4px;
-        }}
-        .quality-grade {{
+        }
+        .quality-grade {
             font-size: 12px;
             color: #555;
             margin-top: 6px;
-        }}
-        .view-link {{
+        }
+        .view-link {
             display: inline-block;
             margin-top: 8px;
             padding: 6px 12px;
@@ -183,27 +198,43 @@ HTML_TEMPLATE = """<!DOCTYPE html>
             border-radius: 4px;
             font-size: 13px;
             transition: background-color 0.2s;
-        }}
-        .view-link:hover {{
+        }
+        .view-link:hover {
             background-color: #5a8500;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             color: #888;
             margin-top: 30px;
             font-size: 13px;
-        }}
-        .footer a {{
+        }
+        .footer a {
             color: #74ac00;
             text-decoration: none;
-        }}
-        .footer a:hover {{
+        }
+        .footer a:hover {
             text-decoration: underline;
-        }}
-    </style>
+        }
+    """
+
+# Page markup around the title and the content, assembled by _iter_page
+_PAGE_HEAD_START = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>iNaturalist Species Report: """
+_PAGE_TITLE_END = """</title>
+    """
+_PAGE_INLINE_STYLE = "<style>" + PAGE_STYLE + "</style>"
+_PAGE_STYLESHEET_LINK = '<link rel="stylesheet" href="%s">'
+# File name used for the stylesheet by --external-css
+STYLESHEET_NAME = "inat-diff.css"
+_PAGE_BODY_START = """
 </head>
 <body>
-    {content}
+    """
+_PAGE_TAIL = """
     <div class="footer">
         <p>Generated from iNaturalist data using <a href="https://github.com/yourusername/inat-diff">inat-diff</a></p>
         <p>Data from <a href="https://www.inaturalist.org">iNaturalist.org</a></p>
@@ -212,6 +243,47 @@ HTML_TEMPLATE = """<!DOCTYPE html>
 </html>
 """
 
+# Markup for one entry in a species list, filled in by format_species_item with
+# (display_name, badges_html, obs_count, quality_html, historical_html, obs_link).
+# printf-style formatting is measurably cheaper than str.format for this
+# per-species template.
+SPECIES_ITEM_TEMPLATE = """
+    <li class="species-item">
+        <div class="species-info">
+            <div class="species-name">%s</div>
+            <div class="species-meta">
+                %s
+            </div>
+        </div>
+        <div class="species-stats">
+            <div class="obs-count">%s</div>
+            <div class="obs-label">observations</div>
+            %s
+            %s
+            <a href="%s" class="view-link">View on iNaturalist</a>
+        </div>
+    </li>
+    """
+SPECIES_SECTION_TAIL = """
+            </ul>
+        </div>
+        """
+
+
+# Characters that must not appear unescaped in HTML text or attribute values
+_HTML_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#39;",
+})
+
+
+def _escape(value: Any) -> str:
+    """Escape a value from the results JSON for inclusion in the report."""
+    return str(value).translate(_HTML_ESCAPE)
+
 
 def _normalize_int(value: Any) -> Optional[int]:
     """Return value as int if possible, otherwise None."""
@@ -221,131 +293,200 @@ def _normalize_int(value: Any) -> Optional[int]:
         return None
 
 
-@lru_cache(maxsize=512)
-def _fetch_highest_quality_grade(taxon_id: int, place_id: Optional[int]) -> tuple[Optional[str], Optional[str]]:
-    """Return highest available observation quality grade for a taxon.
+def use_client(client: iNatClient) -> None:
+    """Use the given client (e.g. one with a response cache) for quality-grade lookups."""
+    global _client
+    _client = client
 
-    Returns:
-        Tuple of (grade, error_message) where:
-        - grade: The quality grade string ('research', 'needs_id', 'casual') or None if no observations
-        - error_message: Error description if API call failed, None otherwise
-    """
-    base_params = {"taxon_id": taxon_id, "per_page": 1}
-    if place_id is not None:
-        base_params["place_id"] = place_id
 
-    max_retries = 3
-    retry_delay = 1.0  # Initial retry delay in seconds
+def _get_client() -> iNatClient:
+    """Return the shared API client used for quality-grade lookups."""
+    global _client
+    if _client is None:
+        _client = iNatClient(user_agent="inat-diff-visualize")
+    return _client
 
-    for grade in QUALITY_PRIORITY:
-        params = dict(base_params)
-        params["quality_grade"] = grade
-
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(
-                    API_BASE_URL, params=params, timeout=REQUEST_TIMEOUT, headers={"User-Agent": "inat-diff-visualize"}
-                )
-                response.raise_for_status()
-                payload = response.json()
-
-                # Success - check if this grade has results
-                if payload.get("total_results"):
-                    return (grade, None)
-                # No results for this grade, try next grade
-                break
-
-            except requests.RequestException as e:
-                if attempt < max_retries - 1:
-                    # Retry with exponential backoff
-                    time.sleep(retry_delay * (2 ** attempt))
-                else:
-                    # Final attempt failed
-                    return (None, f"API error: {str(e)}")
-            except (ValueError, KeyError) as e:
-                # JSON parsing error - don't retry
-                return (None, f"Invalid API response: {str(e)}")
 
-    # No observations found for any quality grade
-    return (None, None)
+@lru_cache(maxsize=128)
+def _fetch_quality_grades_bulk(taxon_ids: tuple, place_id: Optional[int], grade: str, ttl_bucket: int) -> frozenset:
+    """Return the subset of taxon_ids with at least one observation of the given quality grade.
 
+    ttl_bucket only keys the cache: callers pass the current QUALITY_CACHE_TTL
+    period, so results are refetched once that period ends.
 
-def annotate_species_with_quality(species_list: Iterable[Dict[str, Any]], place_id: Any, rate_limit: float = 1.2) -> None:
+    A single species_counts query covers every taxon in the batch. Its rows are
+    leaf taxa, so a requested taxon matches if it is a row's taxon or one of
+    that row's ancestors (the same "taxon or descendants" rule a per-taxon
+    observation query uses).
+
+    Raises:
+        iNatAPIError: If the API request fails
+    """
+    requested = set(taxon_ids)
+    found = set()
+    for result in _get_client().iter_species_counts(
+        taxon_id=taxon_ids, place_id=place_id, quality_grade=grade, per_page=500
+    ):
+        taxon = result.get("taxon") or {}
+        found.update(requested.intersection(taxon.get("ancestor_ids") or ()))
+        if taxon.get("id") in requested:
+            found.add(taxon["id"])
+    return frozenset(found)
+
+
+def annotate_species_with_quality(species_list: Iterable[Dict[str, Any]], place_id: Any,
+                                  rate_limit: Optional[float] = None) -> None:
     """Augment each species dict with its highest observation quality label.
 
     Note: This function modifies the species dictionaries in-place by adding a
     'highest_quality_grade_label' field to each species.
 
+    Taxa are looked up in batches of QUALITY_BATCH_SIZE, fetched concurrently,
+    one grade at a time from best to worst; each later grade only queries taxa
+    still unassigned. Species with an observation_count of 0 are labeled
+    "Unknown" without any API calls. After QUALITY_MAX_FAILURES consecutive failed
+    batches the API is assumed to be down and every remaining species is
+    labeled "API Error" without further requests. Requests are paced by the
+    rate limit of the lookup client (see use_client).
+
     Args:
         species_list: Iterable of species dictionaries to annotate
         place_id: iNaturalist place ID for the region
-        rate_limit: Seconds to wait between API calls (default: 1.2)
+        rate_limit: Deprecated and ignored; set it on the lookup client instead
     """
+    if rate_limit is not None:
+        warn_rate_limit_ignored("annotate_species_with_quality")
     normalized_place_id = _normalize_int(place_id)
-    total_species = len(species_list) if hasattr(species_list, '__len__') else None
-
-    for idx, species in enumerate(species_list, 1):
-        # Progress indication
-        if total_species:
-            print(f"Fetching quality grades: {idx}/{total_species} species...", file=sys.stderr)
-        else:
-            print(f"Fetching quality grades: {idx} species...", file=sys.stderr)
+    client = _get_client()
 
+    species_by_taxon: Dict[int, list] = {}
+    for species in species_list:
         taxon_id = _normalize_int(species.get("id"))
-        if taxon_id is None:
+        if taxon_id is None or species.get("observation_count") == 0:
+            # No observations means no grade to find
             species["highest_quality_grade_label"] = "Unknown"
-            continue
-
-        grade_key, error_msg = _fetch_highest_quality_grade(taxon_id, normalized_place_id)
-
-        if error_msg:
-            # API call failed
-            species["highest_quality_grade_label"] = "API Error"
-            species_name = species.get("name", f"taxon {taxon_id}")
-            print(f"Error fetching quality for {species_name}: {error_msg}", file=sys.stderr)
-        elif grade_key:
-            # Successfully found quality grade
-            species["highest_quality_grade_label"] = QUALITY_LABELS.get(grade_key, grade_key.title())
         else:
-            # No observations found (shouldn't normally happen)
-            species["highest_quality_grade_label"] = "Unknown"
+            species_by_taxon.setdefault(taxon_id, []).append(species)
+
+    ttl_bucket = int(time.time() // QUALITY_CACHE_TTL)
+    failures = 0
+    failures_lock = threading.Lock()
+
+    def fetch(batch: list, grade: str):
+        nonlocal failures
+        if failures >= QUALITY_MAX_FAILURES:
+            return None, iNatAPIError("skipped after repeated API failures")
+        try:
+            matched = _fetch_quality_grades_bulk(tuple(batch), normalized_place_id, grade, ttl_bucket)
+        except iNatAPIError as e:
+            with failures_lock:
+                failures += 1
+            return None, e
+        with failures_lock:
+            failures = 0
+        return matched, None
+
+    pending = list(species_by_taxon)
+    labels: Dict[int, str] = {}
+    for grade in QUALITY_PRIORITY:
+        if not pending:
+            break
+        batches = [pending[i:i + QUALITY_BATCH_SIZE] for i in range(0, len(pending), QUALITY_BATCH_SIZE)]
+        print(
+            f"Fetching quality grades ({QUALITY_LABELS[grade]}): {len(pending)} species "
+            f"in {len(batches)} batch(es)...",
+            file=sys.stderr
+        )
+
+        # Batches are independent; the client's rate limiter paces them
+        with ThreadPoolExecutor(max_workers=client.max_concurrent) as executor:
+            outcomes = list(executor.map(lambda batch: fetch(batch, grade), batches))
+
+        still_pending = []
+        for batch, (matched, error) in zip(batches, outcomes):
+            if error is not None:
+                print(f"Error fetching quality for {len(batch)} species: {error}", file=sys.stderr)
+                labels.update(dict.fromkeys(batch, QUALITY_ERROR_LABEL))
+                continue
+            for taxon_id in batch:
+                if taxon_id in matched:
+                    labels[taxon_id] = QUALITY_LABELS[grade]
+                else:
+                    still_pending.append(taxon_id)
+        pending = still_pending
+        if failures >= QUALITY_MAX_FAILURES and pending:
+            print(
+                f"Skipping quality lookups for {len(pending)} remaining species after repeated API failures",
+                file=sys.stderr
+            )
+            labels.update(dict.fromkeys(pending, QUALITY_ERROR_LABEL))
+            break
 
-        # Rate limiting - sleep after each API call
-        # (We sleep even after the last one to keep the logic simple)
-        time.sleep(rate_limit)
+    for taxon_id, species_group in species_by_taxon.items():
+        # Taxa with no observations at any grade (shouldn't normally happen)
+        label = labels.get(taxon_id, "Unknown")
+        for species in species_group:
+            species["highest_quality_grade_label"] = label
 
 
-def format_species_item(species: Dict[str, Any], query: Dict[str, Any], is_new: bool = False) -> str:
-    """Format a single species as HTML list item."""
-    name = species.get("name", "Unknown")
-    common_name = species.get("preferred_common_name")
-    taxon_id = species.get("id")
-    place_id = query.get("place_id")
-    rank = species.get("rank", "").capitalize()
-    iconic_taxon = species.get("iconic_taxon", "")
-    obs_count = species.get("observation_count", 0)
-    historical_count = species.get("historical_count")
-    quality_label = species.get("highest_quality_grade_label")
+OBSERVATIONS_URL = "https://www.inaturalist.org/observations"
 
-    # Build display name
-    if common_name:
-        display_name = f'{common_name} <span class="species-name-latin">{name}</span>'
-    else:
-        display_name = name
 
-    # Build observation link
-    obs_link = f"https://www.inaturalist.org/observations?place_id={place_id}&taxon_id={taxon_id}"
+def _observations_link_prefix(query: Dict[str, Any]) -> str:
+    """Return the observations link for the query's place, up to the taxon ID."""
+    return f"{OBSERVATIONS_URL}?place_id={_escape(query.get('place_id'))}&taxon_id="
 
-    # Build badges
+
+@lru_cache(maxsize=1024)
+def _badges_html(is_new: bool, rank: str, iconic_taxon: str) -> str:
+    """Return the badge markup for a species; there are few distinct combinations per report."""
     badges = []
     if is_new:
         badges.append('<span class="species-badge badge-new">New</span>')
     if rank:
-        badges.append(f'<span class="species-badge badge-rank">{rank}</span>')
+        badges.append(f'<span class="species-badge badge-rank">{_escape(rank.capitalize())}</span>')
     if iconic_taxon:
-        badges.append(f'<span class="species-badge badge-taxon">{iconic_taxon}</span>')
+        badges.append(f'<span class="species-badge badge-taxon">{_escape(iconic_taxon)}</span>')
+    return "".join(badges)
+
+
+@cache
+def _quality_html(quality_label: str) -> str:
+    """Return the quality grade line for a species (labels are a small, fixed set)."""
+    return f'<div class="quality-grade">Best quality: {_escape(quality_label)}</div>'
 
-    badges_html = "".join(badges)
+
+def format_species_item(
+    species: Dict[str, Any],
+    query: Dict[str, Any],
+    is_new: bool = False,
+    obs_link_prefix: Optional[str] = None,
+) -> str:
+    """Format a single species as HTML list item.
+
+    obs_link_prefix is the query's observations link up to the taxon ID; callers
+    formatting many species for one query can compute it once and pass it in.
+    """
+    if obs_link_prefix is None:
+        obs_link_prefix = _observations_link_prefix(query)
+    get = species.get
+    name = _escape(get("name", "Unknown"))
+    common_name = get("preferred_common_name")
+    taxon_id = get("id")
+    obs_count = get("observation_count", 0)
+    historical_count = get("historical_count")
+    quality_label = get("highest_quality_grade_label")
+
+    # Build display name
+    if common_name:
+        display_name = f'{_escape(common_name)} <span class="species-name-latin">{name}</span>'
+    else:
+        display_name = name
+
+    # Build observation link
+    obs_link = f"{obs_link_prefix}{_escape(taxon_id)}"
+
+    badges_html = _badges_html(is_new, get("rank", ""), get("iconic_taxon", ""))
 
     # Build historical count display
     historical_html = ""
@@ -355,39 +496,67 @@ def format_species_item(species: Dict[str, Any], query: Dict[str, Any], is_new:
         else:
             historical_html = f'<div class="historical-count">Historical: {historical_count:,} obs.</div>'
 
-    quality_html = ""
-    if quality_label:
-        quality_html = f'<div class="quality-grade">Best quality: {quality_label}</div>'
+    quality_html = _quality_html(quality_label) if quality_label else ""
 
-    return f"""
-    <li class="species-item">
-        <div class="species-info">
-            <div class="species-name">{display_name}</div>
-            <div class="species-meta">
-                {badges_html}
-            </div>
-        </div>
-        <div class="species-stats">
-            <div class="obs-count">{obs_count:,}</div>
-            <div class="obs-label">observations</div>
-            {quality_html}
-            {historical_html}
-            <a href="{obs_link}" class="view-link">View on iNaturalist</a>
-        </div>
-    </li>
-    """
+    return SPECIES_ITEM_TEMPLATE % (
+        display_name,
+        badges_html,
+        format(obs_count, ","),
+        quality_html,
+        historical_html,
+        obs_link,
+    )
 
 
-def generate_new_species_html(data: Dict[str, Any], include_quality: bool = False, rate_limit: float = 1.2) -> str:
+def _iter_page(title: str, content: Iterable[str], stylesheet: Optional[str] = None) -> Iterator[str]:
+    """Yield a complete HTML page around the given content chunks.
+
+    The stylesheet is inlined unless a stylesheet URL is given to link instead.
+    """
+    yield _PAGE_HEAD_START
+    yield title
+    yield _PAGE_TITLE_END
+    yield _PAGE_STYLESHEET_LINK % _escape(stylesheet) if stylesheet else _PAGE_INLINE_STYLE
+    yield _PAGE_BODY_START
+    yield from content
+    yield _PAGE_TAIL
+
+
+def _iter_species_section(head: str, species: Iterable[Dict[str, Any]], query: Dict[str, Any], is_new: bool) -> Iterator[str]:
+    """Yield a species list section one item at a time."""
+    yield head
+    obs_link_prefix = _observations_link_prefix(query)
+    for sp in species:
+        yield format_species_item(sp, query, is_new=is_new, obs_link_prefix=obs_link_prefix)
+    yield SPECIES_SECTION_TAIL
+
+
+def generate_new_species_html(data: Dict[str, Any], include_quality: bool = False,
+        rate_limit: Optional[float] = None, stylesheet: Optional[str] = None) -> str:
     """Generate HTML for new-species command output."""
+    if rate_limit is not None:
+        warn_rate_limit_ignored("generate_new_species_html")
+    return "".join(iter_new_species_html(
+        data, include_quality=include_quality, stylesheet=stylesheet
+    ))
+
+
+def iter_new_species_html(data: Dict[str, Any], include_quality: bool = False,
+        rate_limit: Optional[float] = None, stylesheet: Optional[str] = None) -> Iterator[str]:
+    """Generate HTML for new-species command output as a sequence of chunks.
+
+    Quality grades are looked up before this returns; only rendering is deferred.
+    """
+    if rate_limit is not None:
+        warn_rate_limit_ignored("iter_new_species_html")
     query = data.get("query", {})
-    region = query.get("region", "Unknown Region")
-    time_period = query.get("time_period", "")
-    start_date = query.get("start_date", "")
-    end_date = query.get("end_date", "")
+    region = _escape(query.get("region", "Unknown Region"))
+    time_period = _escape(query.get("time_period", ""))
+    start_date = _escape(query.get("start_date", ""))
+    end_date = _escape(query.get("end_date", ""))
 
-    lookback_years = data.get("lookback_years", 0)
-    lookback_period = data.get("lookback_period", "")
+    lookback_years = _escape(data.get("lookback_years", 0))
+    lookback_period = _escape(data.get("lookback_period", ""))
 
     total_species = data.get("total_species_in_period", 0)
     new_count = data.get("new_species_count", 0)
@@ -428,32 +597,43 @@ def generate_new_species_html(data: Dict[str, Any], include_quality: bool = Fals
     """
 
     # Build new species list
-    new_species_html = ""
+    new_species_html = ()
     if new_species:
         if include_quality:
-            annotate_species_with_quality(new_species, query.get("place_id"), rate_limit=rate_limit)
-        species_items = [format_species_item(sp, query, is_new=True) for sp in new_species]
-        new_species_html = f"""
+            annotate_species_with_quality(new_species, query.get("place_id"))
+        new_species_html = _iter_species_section(f"""
         <div class="species-section">
             <h2>New Species ({new_count:,})</h2>
             <p>Species observed in {region} during {time_period} with no observations in the previous {lookback_years} years.</p>
             <ul class="species-list">
-                {"".join(species_items)}
-            </ul>
-        </div>
-        """
+                """, new_species, query, is_new=True)
 
-    content = header + summary + new_species_html
-    return HTML_TEMPLATE.format(title=title, content=content)
+    return _iter_page(title, chain((header, summary), new_species_html), stylesheet)
 
 
-def generate_list_species_html(data: Dict[str, Any], include_quality: bool = False, rate_limit: float = 1.2) -> str:
+def generate_list_species_html(data: Dict[str, Any], include_quality: bool = False,
+        rate_limit: Optional[float] = None, stylesheet: Optional[str] = None) -> str:
     """Generate HTML for list-species command output."""
+    if rate_limit is not None:
+        warn_rate_limit_ignored("generate_list_species_html")
+    return "".join(iter_list_species_html(
+        data, include_quality=include_quality, stylesheet=stylesheet
+    ))
+
+
+def iter_list_species_html(data: Dict[str, Any], include_quality: bool = False,
+        rate_limit: Optional[float] = None, stylesheet: Optional[str] = None) -> Iterator[str]:
+    """Generate HTML for list-species command output as a sequence of chunks.
+
+    Quality grades are looked up before this returns; only rendering is deferred.
+    """
+    if rate_limit is not None:
+        warn_rate_limit_ignored("iter_list_species_html")
     query = data.get("query", {})
-    region = query.get("region", "Unknown Region")
-    time_period = query.get("time_period", "")
-    start_date = query.get("start_date", "")
-    end_date = query.get("end_date", "")
+    region = _escape(query.get("region", "Unknown Region"))
+    time_period = _escape(query.get("time_period", ""))
+    start_date = _escape(query.get("start_date", ""))
+    end_date = _escape(query.get("end_date", ""))
 
     species_count = data.get("species_count", 0)
     total_observations = data.get("total_observations", 0)
@@ -486,36 +666,32 @@ def generate_list_species_html(data: Dict[str, Any], include_quality: bool = Fal
     """
 
     # Build species list
-    species_html = ""
+    species_html = ()
     if species:
         if include_quality:
-            annotate_species_with_quality(species, query.get("place_id"), rate_limit=rate_limit)
-        species_items = [format_species_item(sp, query, is_new=False) for sp in species]
-        species_html = f"""
+            annotate_species_with_quality(species, query.get("place_id"))
+        species_html = _iter_species_section(f"""
         <div class="species-section">
             <h2>All Species ({species_count:,})</h2>
             <ul class="species-list">
-                {"".join(species_items)}
-            </ul>
-        </div>
-        """
+                """, species, query, is_new=False)
 
-    content = header + summary + species_html
-    return HTML_TEMPLATE.format(title=title, content=content)
+    return _iter_page(title, chain((header, summary), species_html), stylesheet)
 
 
-def generate_query_html(data: Dict[str, Any]) -> str:
+def generate_query_html(data: Dict[str, Any], stylesheet: Optional[str] = None) -> str:
     """Generate HTML for query command output."""
     query = data.get("query", {})
-    taxon_name = query.get("taxon_name", "Unknown")
-    region = query.get("region", "Unknown Region")
-    time_period = query.get("time_period", "")
-    start_date = query.get("start_date", "")
-    end_date = query.get("end_date", "")
+    taxon_name = _escape(query.get("taxon_name", "Unknown"))
+    region = _escape(query.get("region", "Unknown Region"))
+    time_period = _escape(query.get("time_period", ""))
+    start_date = _escape(query.get("start_date", ""))
+    end_date = _escape(query.get("end_date", ""))
     total_results = data.get("total_results", 0)
 
     is_new = data.get("is_new_to_region")
-    analysis = data.get("analysis", "")
+    analysis = data.get("analysis")
+    analysis = _escape(analysis) if analysis else ""
 
     # Build header
     title = f"{taxon_name} in {region}"
@@ -546,9 +722,7 @@ def generate_query_html(data: Dict[str, Any]) -> str:
     """
 
     # Build observation link
-    place_id = query.get("place_id")
-    taxon_id = query.get("taxon_id")
-    obs_link = f"https://www.inaturalist.org/observations?place_id={place_id}&taxon_id={taxon_id}"
+    obs_link = f"{_observations_link_prefix(query)}{_escape(query.get('taxon_id'))}"
 
     link_section = f"""
     <div class="species-section">
@@ -559,23 +733,79 @@ def generate_query_html(data: Dict[str, Any]) -> str:
     </div>
     """
 
-    content = header + summary + link_section
-    return HTML_TEMPLATE.format(title=title, content=content)
+    return "".join(_iter_page(title, (header, summary, link_section), stylesheet))
 
 
-def generate_html(data: Dict[str, Any], include_quality: bool = False, rate_limit: float = 1.2) -> str:
+def generate_html(data: Dict[str, Any], include_quality: bool = False,
+        rate_limit: Optional[float] = None, stylesheet: Optional[str] = None) -> str:
     """Generate HTML based on the type of query results."""
+    if rate_limit is not None:
+        warn_rate_limit_ignored("generate_html")
+    return "".join(iter_html(
+        data, include_quality=include_quality, stylesheet=stylesheet
+    ))
+
+
+def iter_html(data: Dict[str, Any], include_quality: bool = False,
+        rate_limit: Optional[float] = None, stylesheet: Optional[str] = None) -> Iterator[str]:
+    """Generate HTML based on the type of query results, as a sequence of chunks.
+
+    Large species lists can be written out piece by piece instead of being
+    built up as one string first. If stylesheet is given, the page links to
+    that URL instead of inlining PAGE_STYLE.
+    """
+    if rate_limit is not None:
+        warn_rate_limit_ignored("iter_html")
     # Detect result type based on fields present
     if "new_species_count" in data:
-        return generate_new_species_html(data, include_quality=include_quality, rate_limit=rate_limit)
+        return iter_new_species_html(
+            data, include_quality=include_quality, stylesheet=stylesheet
+        )
     elif "species_count" in data and "species" in data:
-        return generate_list_species_html(data, include_quality=include_quality, rate_limit=rate_limit)
+        return iter_list_species_html(
+            data, include_quality=include_quality, stylesheet=stylesheet
+        )
     elif "query" in data and "taxon_name" in data.get("query", {}):
-        return generate_query_html(data)
+        return iter((generate_query_html(data, stylesheet=stylesheet),))
     else:
         raise ValueError("Unknown JSON format - cannot determine query type")
 
 
+def _cached_report_path(raw: bytes, include_quality: bool, stylesheet: Optional[str]) -> Path:
+    """Return where the report for this input is cached.
+
+    The key covers the input bytes, the options that change the output and the
+    source of this module, which holds every template and the stylesheet (so
+    any rendering change invalidates old reports).
+    """
+    key = hashlib.sha1(raw)
+    key.update(Path(__file__).read_bytes())
+    key.update(f"\0{include_quality}\0{stylesheet}".encode())
+    return HTML_CACHE_DIR / f"{key.hexdigest()}.html"
+
+
+def _has_quality_errors(data: Dict[str, Any]) -> bool:
+    """Whether any species in the results was labeled after a failed quality lookup."""
+    return any(
+        species.get("highest_quality_grade_label") == QUALITY_ERROR_LABEL
+        for key in ("new_species", "established_species", "species")
+        for species in data.get(key) or ()
+    )
+
+
+def _is_fresh(path: Path, include_quality: bool) -> bool:
+    """Whether a cached report can be reused.
+
+    Reports without quality grades depend only on the input; ones with them are
+    kept as long as the quality lookups themselves are cached.
+    """
+    try:
+        age = time.time() - path.stat().st_mtime
+    except OSError:
+        return False
+    return not include_quality or age < iNatClient.UNDATED_EXPIRE_AFTER
+
+
 def main():
     """CLI entry point for visualization."""
     parser = argparse.ArgumentParser(
@@ -596,18 +826,38 @@ Examples:
     parser.add_argument(
         "--include-quality",
         action="store_true",
-        help="Include observation quality grade for each species (requires API calls, slow for large datasets)"
+        help="Include observation quality grade for each species (requires a few batched API calls)"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache quality-grade lookups and rendered reports on disk so repeat runs skip the work (quality lookups require inat-diff[cache])"
+    )
+    parser.add_argument(
+        "--external-css",
+        action="store_true",
+        help=f"Write the stylesheet to {STYLESHEET_NAME} next to the output file and link to it instead of inlining it"
     )
     parser.add_argument(
         "--rate-limit",
         type=float,
         default=1.2,
         dest="rate_limit",
-        help="Seconds to wait between API calls when using --include-quality (default: 1.2 = 50/min, iNat limit is 60-100/min)"
+        help="Average seconds per API call when using --include-quality (default: 1.2 = 50/min, iNat limit is 60-100/min)"
     )
 
     args = parser.parse_args()
 
+    if args.include_quality:
+        cache_path = iNatClient.DEFAULT_CACHE_PATH if args.cache else None
+        try:
+            use_client(iNatClient(
+                user_agent="inat-diff-visualize", rate_limit=args.rate_limit, cache_path=cache_path
+            ))
+        except ImportError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
     # Read input JSON
     try:
         input_path = Path(args.input_file)
@@ -615,18 +865,41 @@ Examples:
             print(f"Error: Input file '{args.input_file}' not found", file=sys.stderr)
             sys.exit(1)
 
-        with open(input_path, 'r') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
+        with open(input_path, 'rb') as f:
+            raw = f.read()
+        data = loads_json(raw)
+    except json.JSONDecodeError as e:  # Also raised by orjson
         print(f"Error: Invalid JSON in '{args.input_file}': {e}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
         print(f"Error reading '{args.input_file}': {e}", file=sys.stderr)
         sys.exit(1)
 
+    stylesheet = None
+    if args.external_css:
+        stylesheet = STYLESHEET_NAME
+        css_path = Path(args.output_file).parent / STYLESHEET_NAME
+        try:
+            css_path.write_text(PAGE_STYLE, encoding="utf-8")
+        except OSError as e:
+            print(f"Error writing '{css_path}': {e}", file=sys.stderr)
+            sys.exit(1)
+
+    # Reuse the report from an earlier run on the same input
+    cached_path = _cached_report_path(raw, args.include_quality, stylesheet) if args.cache else None
+    if cached_path is not None and _is_fresh(cached_path, args.include_quality):
+        try:
+            shutil.copyfile(cached_path, args.output_file)
+            print(f"HTML report generated: {args.output_file} (cached)")
+            return
+        except OSError as e:
+            print(f"Warning: could not reuse cached report: {e}", file=sys.stderr)
+
     # Generate HTML
     try:
-        html = generate_html(data, include_quality=args.include_quality, rate_limit=args.rate_limit)
+        chunks = iter_html(
+            data, include_quality=args.include_quality, stylesheet=stylesheet
+        )
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -634,16 +907,25 @@ Examples:
         print(f"Error generating HTML: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Write output
+    # Write output, rendering species items as they are written
     try:
         output_path = Path(args.output_file)
-        with open(output_path, 'w') as f:
-            f.write(html)
+        with open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+            f.writelines(chunk.encode("utf-8") for chunk in chunks)
         print(f"HTML report generated: {args.output_file}")
     except Exception as e:
         print(f"Error writing '{args.output_file}': {e}", file=sys.stderr)
         sys.exit(1)
 
+    # A report with failed quality lookups would keep serving "API Error"
+    # labels after the API recovers, so only cache complete ones
+    if cached_path is not None and not _has_quality_errors(data):
+        try:
+            cached_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(output_path, cached_path)
+        except OSError as e:
+            print(f"Warning: could not cache report: {e}", file=sys.stderr)
+
 
 if __name__ == "__main__":
     main()
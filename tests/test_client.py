@@ -0,0 +1,167 @@
+"""Offline tests for iNatClient paging, using a stubbed HTTP session."""
+
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from inat_diff.client import iNatClient
+from inat_diff.exceptions import iNatAPIError
+from inat_diff.query import SpeciesQuery
+
+
+class FakeResponse:
+    """Just enough of requests.Response for iNatClient._make_request."""
+
+    def __init__(self, payload=None, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = json.dumps(payload or {}).encode()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+
+
+def species_page(page, per_page, total_results, first_id=0):
+    """One species_counts page whose taxon IDs encode the page they came from."""
+    start = (page - 1) * per_page
+    rows = [
+        {"count": 1, "taxon": {"id": first_id + i + 1, "ancestor_ids": [1]}}
+        for i in range(start, min(start + per_page, total_results))
+    ]
+    return {"total_results": total_results, "per_page": per_page, "results": rows}
+
+
+def stub_client(handler, **kwargs):
+    """Return a client with no rate limit whose requests are answered by handler(url, params)."""
+    client = iNatClient(rate_limit=0, **kwargs)
+    calls = []
+    lock = threading.Lock()
+
+    def get(url, params=None, **_):
+        with lock:
+            calls.append((url, dict(params or {})))
+        return handler(url, params or {})
+
+    client.session.get = get
+    return client, calls
+
+
+def test_pages_come_back_in_order_and_each_is_fetched_once():
+    def handler(url, params):
+        # Later pages answer sooner, so completion order differs from page order
+        time.sleep(0.01 * (10 - params["page"]))
+        return FakeResponse(species_page(params["page"], 10, 95))
+
+    client, calls = stub_client(handler)
+    ids = [row["taxon"]["id"] for row in client.iter_species_counts(per_page=10)]
+
+    assert ids == list(range(1, 96))
+    assert sorted(params["page"] for _, params in calls) == list(range(1, 11))
+
+
+def pages_of(per_page, total_results):
+    """A handler serving total_results species rows, per_page at a time."""
+    return lambda url, params: FakeResponse(species_page(params["page"], per_page, total_results))
+
+
+def test_max_pages_limits_the_requests():
+    client, calls = stub_client(pages_of(10, 95))
+
+    assert len(client.get_all_species_counts(per_page=10, max_pages=3)) == 30
+    assert len(calls) == 3
+
+
+def test_empty_first_page_makes_one_request():
+    client, calls = stub_client(pages_of(10, 0))
+
+    assert client.get_all_species_counts(per_page=10) == []
+    assert len(calls) == 1
+
+
+def test_stopping_early_leaves_queued_pages_unrequested():
+    client, calls = stub_client(pages_of(10, 400))
+
+    pages = client._iter_pages(client.get_species_counts, per_page=10)
+    next(pages)
+    next(pages)
+    pages.close()
+    time.sleep(0.1)
+
+    # Page 1, plus at most one window of max_concurrent pages ahead of the caller
+    assert len(calls) <= 2 + client.max_concurrent
+
+
+def test_failed_current_period_stops_the_historical_sweep():
+    today = time.strftime("%Y-%m-%d")
+
+    def handler(url, params):
+        if params.get("d2", "") >= today:
+            # Current period: page 1 answers, later pages fail once the
+            # historical sweep is well under way
+            if params["page"] == 1:
+                return FakeResponse(species_page(1, 500, 1500))
+            time.sleep(0.15)
+            return FakeResponse(status_code=500)
+        time.sleep(0.05)
+        return FakeResponse(species_page(params["page"], 500, 40 * 500, first_id=10000))
+
+    client, calls = stub_client(handler)
+
+    start = time.monotonic()
+    with pytest.raises(iNatAPIError):
+        SpeciesQuery(client).find_all_new_species_in_period("last 30 days", "Oregon")
+    assert time.monotonic() - start < 1
+
+    def historical_requests():
+        return sum(1 for _, params in calls if params.get("d2", "") < today)
+
+    at_failure = historical_requests()
+    time.sleep(1)
+    # Only requests already in flight (or about to be) may still go out
+    assert 0 < at_failure < 40
+    assert historical_requests() <= at_failure + 2 * client.max_concurrent
+
+
+def test_historical_sweep_runs_when_first_current_row_has_no_taxon():
+    today = time.strftime("%Y-%m-%d")
+
+    def handler(url, params):
+        if params.get("d2", "") >= today:
+            page = species_page(1, 500, 2)
+            page["results"][0]["taxon"] = None
+            return FakeResponse(page)
+        return FakeResponse(species_page(1, 500, 2))
+
+    client, calls = stub_client(handler)
+    results = SpeciesQuery(client).find_all_new_species_in_period("last 30 days", "Oregon")
+
+    assert any(params.get("d2", "") < today for _, params in calls)
+    assert results["new_species_count"] == 0
+    assert results["established_species_count"] == 1
+
+
+def test_species_listing_total_counts_every_observation():
+    def handler(url, params):
+        if url.endswith("/observations"):
+            # Includes observations identified above the leaf taxa listed below
+            return FakeResponse({"total_results": 57, "results": []})
+        return FakeResponse(species_page(params["page"], 500, 3))
+
+    client, calls = stub_client(handler)
+    results = SpeciesQuery(client).get_all_species_in_period("last 30 days", "Oregon")
+
+    assert results["species_count"] == 3
+    assert results["total_observations"] == 57
+    assert [params["per_page"] for url, params in calls if url.endswith("/observations")] == [0]
+
+
+def test_deprecated_rate_limit_argument_warns_and_leaves_the_client_alone():
+    client, _ = stub_client(pages_of(500, 0))
+
+    with pytest.warns(DeprecationWarning, match="rate_limit"):
+        SpeciesQuery(client).find_all_new_species_in_period("last 30 days", "Oregon", rate_limit=5)
+    assert client.rate_limit == 0
@@ -0,0 +1,11 @@
+"""Tests for the package's lazy top-level imports."""
+
+import inat_diff
+
+
+def test_dir_lists_each_public_name_once():
+    from inat_diff import SpeciesQuery  # noqa: F401 - loads the attribute
+
+    names = dir(inat_diff)
+    assert len(names) == len(set(names))
+    assert set(inat_diff.__all__) <= set(names)
@@ -0,0 +1,95 @@
+"""Tests for the sliding-window RateLimiter."""
+
+import threading
+import time
+
+from inat_diff.ratelimit import RateLimiter
+
+
+def timed_acquire(limiter):
+    """Acquire and release one slot; return (stamp, seconds spent waiting)."""
+    start = time.monotonic()
+    stamp = limiter.acquire()
+    limiter.release()
+    return stamp, time.monotonic() - start
+
+
+def test_calls_within_the_window_limit_are_not_delayed():
+    limiter = RateLimiter(max_calls=3, period=0.5)
+
+    waits = [timed_acquire(limiter)[1] for _ in range(3)]
+
+    assert max(waits) < 0.05
+
+
+def test_call_past_the_window_limit_waits_for_the_oldest_to_age_out():
+    limiter = RateLimiter(max_calls=2, period=0.3)
+    first, _ = timed_acquire(limiter)
+    timed_acquire(limiter)
+
+    stamp, waited = timed_acquire(limiter)
+
+    assert waited >= 0.2
+    assert stamp - first >= 0.3
+
+
+def test_refunded_slot_can_be_reused_immediately():
+    limiter = RateLimiter(max_calls=2, period=5)
+    timed_acquire(limiter)
+    stamp, _ = timed_acquire(limiter)
+
+    limiter.refund(stamp)
+    _, waited = timed_acquire(limiter)
+
+    assert waited < 0.05
+
+
+def test_refunding_an_aged_out_slot_is_harmless():
+    limiter = RateLimiter(max_calls=1, period=0.05)
+    stamp, _ = timed_acquire(limiter)
+    time.sleep(0.1)
+    timed_acquire(limiter)  # Drops the first stamp from the window
+
+    limiter.refund(stamp)
+    limiter.refund(stamp)
+
+
+def test_zero_interval_means_unlimited():
+    limiter = RateLimiter(max_calls=1, period=60)
+    limiter.set_interval(0)
+
+    waits = [timed_acquire(limiter)[1] for _ in range(20)]
+
+    assert max(waits) < 0.05
+
+
+def test_set_interval_converts_seconds_per_call_to_calls_per_window():
+    limiter = RateLimiter(period=60)
+    limiter.set_interval(1.2)
+
+    assert limiter.max_calls == 50
+
+
+def test_in_flight_requests_are_capped_at_max_concurrent():
+    limiter = RateLimiter(max_calls=None, max_concurrent=2)
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def request():
+        nonlocal in_flight, peak
+        with limiter:
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
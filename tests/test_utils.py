@@ -0,0 +1,108 @@
+"""Tests for time-period parsing, pinned against the outputs of the original regex parser."""
+
+from datetime import date
+
+import pytest
+
+from inat_diff.exceptions import InvalidTimeFormatError
+from inat_diff.utils import _parse_time_period, parse_time_period
+
+MID_YEAR = date(2025, 6, 15)
+LEAP_DAY = date(2024, 2, 29)
+
+
+def parse(time_str, today):
+    """Parse time_str as parse_time_period would on the given day."""
+    return _parse_time_period(" ".join(time_str.lower().split()), today)
+
+
+# Inputs the original parser handled; the current one must return the same dates
+UNCHANGED = [
+    ("last 5 days", MID_YEAR, ("2025-06-10", "2025-06-15")),
+    ("Last 1 Day", MID_YEAR, ("2025-06-14", "2025-06-15")),
+    ("past 3 months", MID_YEAR, ("2025-03-17", "2025-06-15")),
+    ("past 3 months", LEAP_DAY, ("2023-12-01", "2024-02-29")),
+    ("last 2 weeks", MID_YEAR, ("2025-06-01", "2025-06-15")),
+    ("past 10 weeks", MID_YEAR, ("2025-04-06", "2025-06-15")),
+    ("last 2 years", MID_YEAR, ("2023-06-15", "2025-06-15")),
+    ("last 4 years", LEAP_DAY, ("2020-02-29", "2024-02-29")),
+    ("last ٥ days", MID_YEAR, ("2025-06-10", "2025-06-15")),
+    ("this month", MID_YEAR, ("2025-06-01", "2025-06-30")),
+    ("this month", LEAP_DAY, ("2024-02-01", "2024-02-29")),
+    ("this month", date(2025, 12, 10), ("2025-12-01", "2025-12-31")),
+    ("last month", MID_YEAR, ("2025-05-01", "2025-05-31")),
+    ("last month", LEAP_DAY, ("2024-01-01", "2024-01-31")),
+    ("last month", date(2025, 1, 10), ("2024-12-01", "2024-12-31")),
+    ("this year", MID_YEAR, ("2025-01-01", "2025-12-31")),
+    ("last year", MID_YEAR, ("2024-01-01", "2024-12-31")),
+    ("  THIS YEAR  ", MID_YEAR, ("2025-01-01", "2025-12-31")),
+    ("30", MID_YEAR, ("2025-05-16", "2025-06-15")),
+    ("30", LEAP_DAY, ("2024-01-30", "2024-02-29")),
+    ("0", MID_YEAR, ("2025-06-15", "2025-06-15")),
+    ("2024-01-01 to 2024-12-31", MID_YEAR, ("2024-01-01", "2024-12-31")),
+    ("2024-01-01   to 2024-12-31", MID_YEAR, ("2024-01-01", "2024-12-31")),
+]
+
+# Inputs both parsers reject
+REJECTED = [
+    "",
+    "yesterday",
+    "last 5",
+    "last days",
+    "last -5 days",
+    "last 5 fortnights",
+    "2024-1-01 to 2024-12-31",
+    "last ² days",
+]
+
+# Deliberate differences from the original parser: (input, today, old result, new result),
+# where a result is either the dates returned or the exception raised
+CHANGED = [
+    # Years are counted back to February 28th instead of failing on a leap day
+    ("last 2 years", LEAP_DAY, ValueError, ("2022-02-28", "2024-02-29")),
+    ("last 1 years", LEAP_DAY, ValueError, ("2023-02-28", "2024-02-29")),
+    # Malformed dates are rejected instead of being sent to the API
+    ("2024-13-01 to 2024-12-31", MID_YEAR, ("2024-13-01", "2024-12-31"), InvalidTimeFormatError),
+    ("2024-02-30 to 2024-12-31", MID_YEAR, ("2024-02-30", "2024-12-31"), InvalidTimeFormatError),
+    # Trailing text is no longer silently ignored
+    ("last 5 days extra", MID_YEAR, ("2025-06-10", "2025-06-15"), InvalidTimeFormatError),
+    ("last 5 dayz", MID_YEAR, ("2025-06-10", "2025-06-15"), InvalidTimeFormatError),
+    ("last 5 daysago", MID_YEAR, ("2025-06-10", "2025-06-15"), InvalidTimeFormatError),
+    ("last 5 dayss", MID_YEAR, ("2025-06-10", "2025-06-15"), InvalidTimeFormatError),
+    (
+        "2024-01-01 to 2024-12-31 extra", MID_YEAR,
+        ("2024-01-01", "2024-12-31"), InvalidTimeFormatError,
+    ),
+    # Runs of whitespace inside named periods are collapsed like everywhere else
+    ("this  month", MID_YEAR, InvalidTimeFormatError, ("2025-06-01", "2025-06-30")),
+    ("this\tyear", MID_YEAR, InvalidTimeFormatError, ("2025-01-01", "2025-12-31")),
+    # Non-decimal digits are a format error rather than a crash in int()
+    ("²", MID_YEAR, ValueError, InvalidTimeFormatError),
+]
+
+
+@pytest.mark.parametrize("time_str, today, expected", UNCHANGED)
+def test_matches_original_parser(time_str, today, expected):
+    assert parse(time_str, today) == expected
+
+
+@pytest.mark.parametrize("time_str", REJECTED)
+def test_rejects_unsupported_formats(time_str):
+    with pytest.raises(InvalidTimeFormatError):
+        parse(time_str, MID_YEAR)
+
+
+@pytest.mark.parametrize("time_str, today, old, new", CHANGED)
+def test_deliberate_changes_from_original_parser(time_str, today, old, new):
+    if isinstance(new, type):
+        with pytest.raises(new):
+            parse(time_str, today)
+    else:
+        assert parse(time_str, today) == new
+
+
+def test_relative_periods_end_today():
+    start, end = parse_time_period("last 7 days")
+
+    assert end == date.today().isoformat()
+    assert start == date.fromordinal(date.today().toordinal() - 7).isoformat()
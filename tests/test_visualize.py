@@ -0,0 +1,13 @@
+"""Offline tests for the HTML report helpers."""
+
+from inat_diff.visualize import QUALITY_ERROR_LABEL, _has_quality_errors
+
+
+def test_reports_with_failed_quality_lookups_are_detected():
+    ok = {"highest_quality_grade_label": "Research Grade"}
+    failed = {"highest_quality_grade_label": QUALITY_ERROR_LABEL}
+
+    assert not _has_quality_errors({"new_species": [ok], "established_species": [{}]})
+    assert _has_quality_errors({"new_species": [ok], "established_species": [failed]})
+    assert _has_quality_errors({"species": [failed]})
+    assert not _has_quality_errors({"query": {}})